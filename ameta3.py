@@ -1,227 +1,401 @@
-import requests
+import functools
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from email.utils import formatdate
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+IANA_TLDS_URL = 'https://data.iana.org/TLD/tlds-alpha-by-domain.txt'
+FALLBACK_TLDS = frozenset({'com', 'org', 'net', 'to', 'ws', 'tax', 'mu', 'by', 'online', 'pro'})
+
+# Local copy of the IANA list so later processes can skip the HTTP fetch.
+# TTMETA_TLDS_PATH points it somewhere persistent, e.g. a mounted data/tlds.txt
+TLDS_CACHE_PATH = os.environ.get('TTMETA_TLDS_PATH') or os.path.join(
+    os.path.expanduser('~'), '.cache', 'ttmeta', 'tlds.txt')
+TLDS_CACHE_MAX_AGE = 7 * 24 * 3600  # seconds
+
+# Process-wide TLD set, filled on first use by get_iana_tlds()
+_TLDS_CACHE = None
+
+def _parse_tlds(text):
+    """Parse the IANA list, skipping comments and empty lines"""
+    return {line.strip().lower() for line in text.splitlines()
+            if line.strip() and not line.startswith('#')}
+
+def _read_tlds_file(max_age=TLDS_CACHE_MAX_AGE):
+    """Return TLDs from the local cache file if it exists and is fresh"""
+    try:
+        if (max_age is not None and
+            time.time() - os.path.getmtime(TLDS_CACHE_PATH) > max_age):
+            return None
+        with open(TLDS_CACHE_PATH, encoding='utf-8') as f:
+            return _parse_tlds(f.read()) or None
+    except OSError:
+        return None
+
+def _write_tlds_file(text):
+    try:
+        os.makedirs(os.path.dirname(TLDS_CACHE_PATH), exist_ok=True)
+        with open(TLDS_CACHE_PATH, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError:
+        pass
+
+def _fetch_iana_tlds():
+    """Fetch IANA TLDs from the official source.
+
+    A stale cache file is revalidated with If-Modified-Since, and is used
+    as-is when IANA can't be reached.
+    """
+    stale = _read_tlds_file(max_age=None)
+    headers = {}
+    if stale:
+        try:
+            mtime = os.path.getmtime(TLDS_CACHE_PATH)
+            headers['If-Modified-Since'] = formatdate(mtime, usegmt=True)
+        except OSError:
+            pass
+    try:
+        with urlopen(Request(IANA_TLDS_URL, headers=headers), timeout=10) as response:
+            text = response.read().decode('utf-8')
+        tlds = _parse_tlds(text)
+        if tlds:
+            _write_tlds_file(text)
+            return tlds
+    except HTTPError as e:
+        if e.code == 304 and stale:
+            # Unchanged upstream; restart the cache file's max-age clock
+            try:
+                os.utime(TLDS_CACHE_PATH)
+            except OSError:
+                pass
+            return stale
+    except (URLError, OSError, ValueError):
+        pass
+    # Fallback to the stale copy, then to common TLDs, if the fetch fails
+    return stale or FALLBACK_TLDS
 
 def get_iana_tlds():
-    """Fetch IANA TLDs from the official source"""
-    try:
-        response = requests.get('https://data.iana.org/TLD/tlds-alpha-by-domain.txt', timeout=10)
-        if response.status_code == 200:
-            # Parse the response, skip comments and empty lines
-            tlds = [line.strip().lower() for line in response.text.splitlines()
-                    if line.strip() and not line.startswith('#')]
-            return set(tlds)
-    except:
-        # Fallback to common TLDs if fetch fails
-        return {'com', 'org', 'net', 'to', 'ws', 'tax', 'mu', 'by', 'online', 'pro'}
-    return {'com', 'org', 'net', 'to', 'ws', 'tax', 'mu', 'by', 'online', 'pro'}
+    """Return the IANA TLD set, fetched at most once per process"""
+    global _TLDS_CACHE
+    if _TLDS_CACHE is None:
+        _TLDS_CACHE = frozenset(_read_tlds_file() or _fetch_iana_tlds())
+    return _TLDS_CACHE
+
+# Character classes for tokenize, looked up by ordinal for ASCII input
+CHAR_ALNUM = 1
+CHAR_DIGIT = 2
+CHAR_DOT = 4
+CHAR_DASH = 8
+
+def _build_charclass():
+    """Build the 128-entry ASCII character class table"""
+    table = bytearray(128)
+    for o in range(128):
+        c = chr(o)
+        if c.isalnum():
+            table[o] |= CHAR_ALNUM
+        if c.isdigit():
+            table[o] |= CHAR_DIGIT
+    table[ord('.')] = CHAR_DOT
+    table[ord('-')] = CHAR_DASH
+    return bytes(table)
+
+_CHARCLASS = _build_charclass()
+
+def _char_class(c):
+    """Classify one character, falling back to str methods beyond ASCII"""
+    o = ord(c)
+    if o < 128:
+        return _CHARCLASS[o]
+    return (CHAR_ALNUM if c.isalnum() else 0) | (CHAR_DIGIT if c.isdigit() else 0)
+
+# The tokenize grammar for ASCII filenames: a www-prefixed token keeps
+# every dot, and any token keeps a dot or dash between two digits
+_TOKEN_RE = re.compile(
+    r'[Ww]{3}(?:[A-Za-z0-9.]|(?<=[0-9])-(?=[0-9]))*'
+    r'|[A-Za-z0-9]+(?:(?<=[0-9])[.-](?=[0-9])[A-Za-z0-9]+)*'
+)
 
 def tokenize(filename):
     s = filename
+    if s.isascii():
+        return _TOKEN_RE.findall(s)
+    return _tokenize_chars(s)
+
+def _tokenize_chars(s):
+    """Character-by-character tokenize, used where the regex can't follow
+    str.isalnum/isdigit (non-ASCII input)"""
+    classes = [_char_class(c) for c in s]
     tokens = []
-    current = []
+    # Start of the token being built, or -1 between tokens; the token is
+    # always the slice s[start:i] since it only ever grows by one character
+    start = -1
     i = 0
+    n = len(s)
 
-    # Get IANA TLDs
-    TLDS = get_iana_tlds()
-
-    while i < len(s):
-        c = s[i]
-        if c.isalnum():
-            current.append(c)
-            i += 1
-        elif c == '.':
-            if current and ''.join(current).lower().startswith('www'):
-                current.append(c)
-                i += 1
-            elif i+1 < len(s) and s[i+1].isdigit() and current and current[-1].isdigit():
-                current.append(c)
-                i += 1
-            else:
-                if current:
-                    tokens.append(''.join(current))
-                    current = []
-                i += 1
-        elif c == '-':
-            if i+1 < len(s) and s[i+1].isdigit() and current and current[-1].isdigit():
-                current.append(c)
-                i += 1
-            else:
-                if current:
-                    tokens.append(''.join(current))
-                    current = []
-                i += 1
-        else:
-            if current:
-                tokens.append(''.join(current))
-                current = []
-            i += 1
-    if current:
-        tokens.append(''.join(current))
+    while i < n:
+        cls = classes[i]
+        if cls & CHAR_ALNUM:
+            if start < 0:
+                start = i
+        elif start >= 0:
+            # A dot or dash between two digits stays inside the token, as
+            # does any dot after a www prefix; everything else ends it
+            keep = cls & (CHAR_DOT | CHAR_DASH) and (
+                (i+1 < n and classes[i+1] & CHAR_DIGIT and classes[i-1] & CHAR_DIGIT) or
+                (cls & CHAR_DOT and s[start:start+3].lower() == 'www'))
+            if not keep:
+                tokens.append(s[start:i])
+                start = -1
+        i += 1
+    if start >= 0:
+        tokens.append(s[start:])
     return tokens
 
 # ========== ADD THE CATEGORIZATION MODULE BELOW ==========
 
-def categorize_tokens(tokens):
+# Expanded known values - all converted to lowercase for case-insensitive matching.
+# Built once at import; categorize_tokens only reads them.
+RESOLUTIONS = frozenset(r.lower() for r in {
+    '240p','360p','480p','540p','576p',
+    '720p','1080p','1440p','2160p','4320p',
+    '2K','2k','4K','8K','2k','3K',
+    'SD','HD','FHD','UHD',
+    'HDR','HDR10','HDR10+','DolbyVision','DV','SDTV','HDTV'
+})
+
+QUALITIES = frozenset(q.lower() for q in {
+    'CAM','CAMRip','TS','TELESYNC','TC','SCR','DVDScr','R5','PDVD',
+    'DVDRip','DVD','DVD5','DVD9','HDRip','HDCAM','HDTS',
+    'WEB-DL','WEBDL','WEB_DL','WEBRip','WEB','WEBRIP','TVRip','HDTVrip',
+    'BDRip','BRRip','BluRay','Blu-ray','BD25','BD50','BD',
+    'Remux','REMUX','Remux','PROPER','REPACK',
+    'LIMITED','UNRATED','EXTENDED','INTERNAL','SCREENER','WORKPRINT','WP'
+})
+
+VIDEO_CODECS = frozenset(v.lower() for v in {
+    'x264','x265','h264','h265','H.264','H.265',
+    'HEVC','AVC','AV1','VP9','MPEG2','MPEG-2','MPEG4',
+    'DivX','XviD','ProRes','VVC','H266'
+})
+
+AUDIO_CODECS = frozenset(a.lower() for a in {
+    'AAC','AAC2.0','AAC5.1','AC3','DD','DD2.0','DD5.1',
+    'E-AC3','EAC3','DDP','DDP5.1','DTS','DTS-HD','DTS-HD MA','DTS:X',
+    'TrueHD','Dolby TrueHD','Atmos','FLAC','OPUS','MP3','WAV','PCM','ALAC',
+    '2.0','5.1','7.1','Stereo','Mono'
+})
+
+SOURCES = frozenset(s.lower() for s in {
+    'AMZN','Amazon','iTunes','ITUNES','NF','NETFLIX','Netflix',
+    'DSNP','Disney+','DisneyPlus','HMAX','HBO','HBO Max','HULU','Hulu',
+    'AppleTV','AppleTV+','Prime','PrimeVideo','GooglePlay','GPLAY',
+    'Peacock','Paramount+','Paramount','BBC','ITV','CBS','NBC','FOX',
+    'CRUNCHYROLL','CR','Ullu','Originals','Jio','Hotstar','SonyLiv'
+})
+
+# Language sets - separate two-letter codes for context-aware processing
+LANGUAGES_FULL = frozenset(l.lower() for l in {
+    # Global
+    'ENG','English','SPA','Spanish','FRE','French','FRENCH',
+    'ITA','Italian','DEU','German','GER','PT','Portuguese','RUS','Russian',
+    'JP','JPN','Japanese','KOR','Korean','CHN','Chinese','AR','Arabic','Chi','Jap',
+
+    # Major Indian languages
+    'HIN','Hindi','TAM','Tamil','TEL','Telugu','MAL','Malayalam','KAN','Kannada',
+    'Bengali','MAR','Marathi','PUN','Punjabi','GUJ','Gujarati','ORI','Odia','ASM','Assamese'
+})
+
+# Two-letter language codes that need context-aware processing
+LANGUAGES_TWO_LETTER = frozenset(l.lower() for l in {
+    'EN', 'ES', 'FR', 'IT', 'DE', 'PT', 'RU', 'JP', 'KO', 'CN', 'AR',
+    'HI', 'TA', 'TE', 'ML', 'KN', 'BN', 'MR', 'PA', 'GU', 'OR', 'AS'
+})
+
+SUBTITLES = frozenset(s.lower() for s in {
+    'SUB','SUBS','SUBBED','Subs','EngSubs','engsubs','ESubs','VOST','VOSTFR','VOSTEN',
+    'MULTiSUB','MULTiSUBS','Multi-Subs','MSubs','HardSub','Hardsub','SoftSubs','ForcedSub','Forced-Sub','CC','ClosedCaptions','sub'
+})
+
+FILE_EXTENSIONS = frozenset(f.lower() for f in {
+    'mkv','mp4','avi','iso','mpeg','mpg','ts','m2ts','mov','wmv','flv','3gp','vob','m4v','webm','mka'
+})
+
+SEASON_INDICATORS = frozenset(s.lower() for s in {'season','seasons','s','S','Series','SERIES'})
+EPISODE_INDICATORS = frozenset(e.lower() for e in {'episode','episodes','ep','eps','e','E','EP','Ep','Part','Chapter','pt','Pt','ch'})
+
+COMPLETE_INDICATORS = frozenset(c.lower() for c in {
+    'complete', 'COMPLETE', 'full', 'full season', 'season pack',
+    'collection', 'collections', 'COLLECTION', 'COLLECTIONS',
+    'boxset', 'BOXSET', 'set', 'SET', 'anthology', 'compilation', 'omnibus',
+    'series', 'SERIES', 'tvpack', 'tv-pack', 'tv pack', 'seasonal pack',
+    'franchise', 'saga', 'universe',
+    'duology', 'trilogy', 'tetralogy', 'quadrilogy', 'pentalogy', 'pentology',
+    'hexalogy', 'hexology', 'heptalogy', 'septology', 'octalogy', 'nonalogy', 'ennealogy',
+    'decalogy', 'decology', 'multilogy',
+    'tri-pack', 'quad-pack', 'penta-pack', 'mega-pack', 'gigapack', 'ultrapack',
+    '全集', 'completo', 'complète', 'complet', 'komplett', 'coleccion', 'collezione'
+})
+
+# Precompiled structural tests used by the categorize passes
+_HAS_DIGIT = re.compile(r'\d').search
+_HAS_ASCII_ALPHA = re.compile(r'[A-Za-z]').search
+_RE_RESOLUTION = re.compile(r'\d+[pP]').fullmatch
+_RE_FILESIZE = re.compile(r'\.*\d[\d.]*[GM]B').fullmatch
+_RE_YEARRANGE = re.compile(r'\d{4}(?:-\d{4})+').fullmatch
+# Matched against the lowercased token; the matching group names the
+# category, tried in priority order. A season or episode number may be
+# followed by a dotted suffix (s01.5, ep03.1080).
+_RE_SEASON_EPISODE = re.compile(
+    r'(?P<season_episode>s\d+e\d+\Z)'
+    r'|(?P<season>s\d+(?:\.|\Z))'
+    r'|(?P<episode>ep?\d+(?:\.|\Z))'
+).match
+
+def _has_alpha(token):
+    """True if any character is a letter; scanned in C for ASCII tokens"""
+    if token.isascii():
+        return _HAS_ASCII_ALPHA(token) is not None
+    return any(c.isalpha() for c in token)
+
+# Lowercase known value -> category for the first pass. Earlier entries win
+# when a value appears in several sets (e.g. 'ts' is a quality, not a file
+# extension), matching the order the first pass used to test them in.
+CATEGORY_LOOKUP = {}
+for _category, _values in (
+    ('resolution', RESOLUTIONS),
+    ('quality', QUALITIES),
+    ('video_codec', VIDEO_CODECS),
+    ('audio_codec', AUDIO_CODECS),
+    ('source', SOURCES),
+    ('language', LANGUAGES_FULL),
+    ('subtitles', SUBTITLES),
+    ('file_extension', FILE_EXTENSIONS),
+):
+    for _value in _values:
+        CATEGORY_LOOKUP.setdefault(_value, _category)
+del _category, _values, _value
+
+# CATEGORY_LOOKUP split by key length, so a token is only hashed against
+# known values it could actually equal
+_LOOKUP_BY_LEN = {}
+for _value, _category in CATEGORY_LOOKUP.items():
+    _LOOKUP_BY_LEN.setdefault(len(_value), {})[_value] = _category
+del _category, _value
+_EMPTY_LOOKUP = {}
+
+# Categories the context checks look for within a few tokens of a position
+_TECH_CATS = frozenset({'resolution', 'quality', 'video_codec', 'audio_codec',
+                        'source', 'file_size', 'year', 'year_range'})
+# Where technical metadata starts; a year alone does not end the episode name
+_TECH_START_CATS = _TECH_CATS - {'year', 'year_range'}
+_EPISODE_CATS = frozenset({'episode_indicator', 'episode'})
+_SEASON_CATS = frozenset({'season_indicator', 'season'})
+
+def _near_categories(categories, accepted, window=3):
+    """Flag each position that has a category from accepted at most window
+    tokens away on either side, not counting the position itself"""
+    n = len(categories)
+    near = [False] * n
+    # Forward sweep: distance back to the last accepted position
+    last = -window - 1
+    for i in range(n):
+        if i - last <= window:
+            near[i] = True
+        if categories[i] in accepted:
+            last = i
+    # Backward sweep: distance ahead to the next accepted position
+    last = n + window
+    for i in range(n - 1, -1, -1):
+        if last - i <= window:
+            near[i] = True
+        if categories[i] in accepted:
+            last = i
+    return near
+
+def categorize_tokens(tokens, tlds=None):
+    """Categorize tokens, reusing the result for a token sequence seen before"""
+    # IANA TLDs are fetched once per process; callers may pass their own set.
+    # A frozenset keeps the cache key hashable and cheap to compare.
+    if tlds is None:
+        tlds = get_iana_tlds()
+    elif not isinstance(tlds, frozenset):
+        tlds = frozenset(tlds)
+    return list(_categorize_cached(tuple(tokens), tlds))
+
+@functools.lru_cache(maxsize=10_000)
+def _categorize_cached(tokens, TLDS):
+    """Categorize a token tuple; returns a tuple of (category, value) pairs"""
     categorized = []
     n = len(tokens)
 
-    # Get IANA TLDs
-    TLDS = get_iana_tlds()
-
-    # Expanded known values - all converted to lowercase for case-insensitive matching
-    RESOLUTIONS = {r.lower() for r in {
-        '240p','360p','480p','540p','576p',
-        '720p','1080p','1440p','2160p','4320p',
-        '2K','2k','4K','8K','2k','3K',
-        'SD','HD','FHD','UHD',
-        'HDR','HDR10','HDR10+','DolbyVision','DV','SDTV','HDTV'
-    }}
-
-    QUALITIES = {q.lower() for q in {
-        'CAM','CAMRip','TS','TELESYNC','TC','SCR','DVDScr','R5','PDVD',
-        'DVDRip','DVD','DVD5','DVD9','HDRip','HDCAM','HDTS',
-        'WEB-DL','WEBDL','WEB_DL','WEBRip','WEB','WEBRIP','TVRip','HDTVrip',
-        'BDRip','BRRip','BluRay','Blu-ray','BD25','BD50','BD',
-        'Remux','REMUX','Remux','PROPER','REPACK',
-        'LIMITED','UNRATED','EXTENDED','INTERNAL','SCREENER','WORKPRINT','WP'
-    }}
-
-    VIDEO_CODECS = {v.lower() for v in {
-        'x264','x265','h264','h265','H.264','H.265',
-        'HEVC','AVC','AV1','VP9','MPEG2','MPEG-2','MPEG4',
-        'DivX','XviD','ProRes','VVC','H266'
-    }}
-
-    AUDIO_CODECS = {a.lower() for a in {
-        'AAC','AAC2.0','AAC5.1','AC3','DD','DD2.0','DD5.1',
-        'E-AC3','EAC3','DDP','DDP5.1','DTS','DTS-HD','DTS-HD MA','DTS:X',
-        'TrueHD','Dolby TrueHD','Atmos','FLAC','OPUS','MP3','WAV','PCM','ALAC',
-        '2.0','5.1','7.1','Stereo','Mono'
-    }}
-
-    SOURCES = {s.lower() for s in {
-        'AMZN','Amazon','iTunes','ITUNES','NF','NETFLIX','Netflix',
-        'DSNP','Disney+','DisneyPlus','HMAX','HBO','HBO Max','HULU','Hulu',
-        'AppleTV','AppleTV+','Prime','PrimeVideo','GooglePlay','GPLAY',
-        'Peacock','Paramount+','Paramount','BBC','ITV','CBS','NBC','FOX',
-        'CRUNCHYROLL','CR','Ullu','Originals','Jio','Hotstar','SonyLiv'
-    }}
-
-    # Language sets - separate two-letter codes for context-aware processing
-    LANGUAGES_FULL = {l.lower() for l in {
-        # Global
-        'ENG','English','SPA','Spanish','FRE','French','FRENCH',
-        'ITA','Italian','DEU','German','GER','PT','Portuguese','RUS','Russian',
-        'JP','JPN','Japanese','KOR','Korean','CHN','Chinese','AR','Arabic','Chi','Jap',
-
-        # Major Indian languages
-        'HIN','Hindi','TAM','Tamil','TEL','Telugu','MAL','Malayalam','KAN','Kannada',
-        'Bengali','MAR','Marathi','PUN','Punjabi','GUJ','Gujarati','ORI','Odia','ASM','Assamese'
-    }}
-
-    # Two-letter language codes that need context-aware processing
-    LANGUAGES_TWO_LETTER = {l.lower() for l in {
-        'EN', 'ES', 'FR', 'IT', 'DE', 'PT', 'RU', 'JP', 'KO', 'CN', 'AR',
-        'HI', 'TA', 'TE', 'ML', 'KN', 'BN', 'MR', 'PA', 'GU', 'OR', 'AS'
-    }}
-
-    SUBTITLES = {s.lower() for s in {
-        'SUB','SUBS','SUBBED','Subs','EngSubs','engsubs','ESubs','VOST','VOSTFR','VOSTEN',
-        'MULTiSUB','MULTiSUBS','Multi-Subs','MSubs','HardSub','Hardsub','SoftSubs','ForcedSub','Forced-Sub','CC','ClosedCaptions','sub'
-    }}
-
-    FILE_EXTENSIONS = {f.lower() for f in {
-        'mkv','mp4','avi','iso','mpeg','mpg','ts','m2ts','mov','wmv','flv','3gp','vob','m4v','webm','mka'
-    }}
-
-    SEASON_INDICATORS = {s.lower() for s in {'season','seasons','s','S','Series','SERIES'}}
-    EPISODE_INDICATORS = {e.lower() for e in {'episode','episodes','ep','eps','e','E','EP','Ep','Part','Chapter','pt','Pt','ch'}}
-
-    COMPLETE_INDICATORS = {c.lower() for c in {
-        'complete', 'COMPLETE', 'full', 'full season', 'season pack',
-        'collection', 'collections', 'COLLECTION', 'COLLECTIONS',
-        'boxset', 'BOXSET', 'set', 'SET', 'anthology', 'compilation', 'omnibus',
-        'series', 'SERIES', 'tvpack', 'tv-pack', 'tv pack', 'seasonal pack',
-        'franchise', 'saga', 'universe',
-        'duology', 'trilogy', 'tetralogy', 'quadrilogy', 'pentalogy', 'pentology',
-        'hexalogy', 'hexology', 'heptalogy', 'septology', 'octalogy', 'nonalogy', 'ennealogy',
-        'decalogy', 'decology', 'multilogy',
-        'tri-pack', 'quad-pack', 'penta-pack', 'mega-pack', 'gigapack', 'ultrapack',
-        '全集', 'completo', 'complète', 'complet', 'komplett', 'coleccion', 'collezione'
-    }}
+    # Lowercase every token once; all passes below index into this list
+    lowers = [token.lower() for token in tokens]
+
+    # Structural flags tested by several passes, computed once per token
+    is_digit = [token.isdigit() for token in tokens]
+    has_digit = [_HAS_DIGIT(token) is not None for token in tokens]
+    has_dash = ['-' in token for token in tokens]
+    year_val = [int(token) if is_digit[i] and len(token) == 4 else -1
+                for i, token in enumerate(tokens)]
+
+    # Per-position category; None means not categorized yet. The value of a
+    # categorized token is the token itself, except for codecs joined from
+    # two tokens, whose combined value is kept in joined_values.
+    categories = [None] * n
+    joined_values = {}
 
     # First pass: Identify all metadata with high confidence
-    metadata_map = {}
     for i, token in enumerate(tokens):
-        lower_token = token.lower()
-
-        # Website detection
-        if ('.' in token and (token.lower().startswith('www.') or
-            any('.' + tld in token.lower() for tld in TLDS))):
-            metadata_map[i] = ('website', token)
-            continue
+        lower_token = lowers[i]
+
+        # Website detection: www. prefix or a known TLD as the last label.
+        # A dotted token is already a single candidate domain, so one set
+        # lookup on its last label covers every TLD at once.
+        if '.' in lower_token:
+            if (lower_token.startswith('www.') or
+                lower_token.rpartition('.')[2] in TLDS):
+                categories[i] = 'website'
+                continue
 
         # Year detection
-        if (len(token) == 4 and token.isdigit() and 1900 <= int(token) <= 2030):
-            metadata_map[i] = ('year', token)
+        if 1900 <= year_val[i] <= 2030:
+            categories[i] = 'year'
             continue
 
         # Year range detection
-        if ('-' in token and all(part.isdigit() and len(part) == 4 for part in token.split('-'))):
-            metadata_map[i] = ('year_range', token)
-            continue
-
-        # Resolution detection
-        if (lower_token in RESOLUTIONS or
-            (token.endswith('p') and token[:-1].isdigit()) or
-            (token.endswith('P') and token[:-1].isdigit())):
-            metadata_map[i] = ('resolution', token)
-            continue
-
-        # Quality detection
-        if lower_token in QUALITIES:
-            metadata_map[i] = ('quality', token)
-            continue
-
-        # Video codec detection
-        if lower_token in VIDEO_CODECS:
-            metadata_map[i] = ('video_codec', token)
+        if has_dash[i] and _RE_YEARRANGE(token):
+            categories[i] = 'year_range'
             continue
 
-        # Audio codec detection
-        if lower_token in AUDIO_CODECS:
-            metadata_map[i] = ('audio_codec', token)
+        # Known-value categories (resolution, quality, codecs, source,
+        # full language names, subtitles, file extension) in one lookup
+        category = _LOOKUP_BY_LEN.get(len(lower_token), _EMPTY_LOOKUP).get(lower_token)
+        if category is not None:
+            categories[i] = category
             continue
 
-        # Source detection
-        if lower_token in SOURCES:
-            metadata_map[i] = ('source', token)
-            continue
-
-        # Language detection - full language names first
-        if lower_token in LANGUAGES_FULL:
-            metadata_map[i] = ('language', token)
-            continue
-
-        # Subtitles detection
-        if lower_token in SUBTITLES:
-            metadata_map[i] = ('subtitles', token)
-            continue
-
-        # File extension detection
-        if lower_token in FILE_EXTENSIONS:
-            metadata_map[i] = ('file_extension', token)
+        # Resolution detection for values outside the known set (e.g. 1280p)
+        if _RE_RESOLUTION(token):
+            categories[i] = 'resolution'
             continue
 
         # File size detection
-        if (token.endswith(('GB', 'MB')) and token[:-2].replace('.', '').isdigit()):
-            metadata_map[i] = ('file_size', token)
+        if _RE_FILESIZE(token):
+            categories[i] = 'file_size'
             continue
 
     # Second pass: Title detection with contextual awareness
     # Find the first non-website token as potential title start
     title_start = 0
     for i in range(n):
-        if i in metadata_map and metadata_map[i][0] == 'website':
+        if categories[i] == 'website':
             title_start = i + 1
         else:
             break
@@ -229,45 +403,32 @@ def categorize_tokens(tokens):
     # Find title end (before any metadata)
     title_end = title_start
     for i in range(title_start, n):
-        if i in metadata_map:
+        if categories[i] is not None:
             title_end = i
             break
     else:
         title_end = n
 
     # New pass: Context-aware language detection for two-letter codes
-    # Only tag two-letter codes as language if they're near metadata
-    for i, token in enumerate(tokens):
-        lower_token = token.lower()
+    # Only tag two-letter codes as language if they're near metadata.
+    # Tagging a language never changes what counts as metadata here, so the
+    # 3-token window check is computed for every position up front.
+    near_tech = _near_categories(categories, _TECH_CATS)
+    for i in range(n):
+        lower_token = lowers[i]
 
         # Skip if already categorized or not a two-letter language code
-        if i in metadata_map or lower_token not in LANGUAGES_TWO_LETTER:
+        if (categories[i] is not None or len(lower_token) != 2 or
+            lower_token not in LANGUAGES_TWO_LETTER):
             continue
 
         # Check if this token is near metadata (not in the middle of title)
-        is_near_metadata = False
-
-        # Check previous tokens (up to 3 tokens back)
-        for j in range(max(0, i-3), i):
-            if j in metadata_map and metadata_map[j][0] in ('resolution', 'quality', 'video_codec',
-                                                          'audio_codec', 'source', 'file_size',
-                                                          'year', 'year_range'):
-                is_near_metadata = True
-                break
-
-        # Check next tokens (up to 3 tokens forward)
-        if not is_near_metadata:
-            for j in range(i+1, min(n, i+4)):
-                if j in metadata_map and metadata_map[j][0] in ('resolution', 'quality', 'video_codec',
-                                                              'audio_codec', 'source', 'file_size',
-                                                              'year', 'year_range'):
-                    is_near_metadata = True
-                    break
+        is_near_metadata = near_tech[i]
 
         # Also check if it's part of a language list pattern (e.g., "ENG ITA SPA")
         if not is_near_metadata and i > 0 and i < n-1:
-            prev_lower = tokens[i-1].lower()
-            next_lower = tokens[i+1].lower()
+            prev_lower = lowers[i-1]
+            next_lower = lowers[i+1]
 
             if (prev_lower in LANGUAGES_FULL or prev_lower in LANGUAGES_TWO_LETTER or
                 next_lower in LANGUAGES_FULL or next_lower in LANGUAGES_TWO_LETTER):
@@ -275,56 +436,35 @@ def categorize_tokens(tokens):
 
         # Tag as language only if near metadata or part of language list
         if is_near_metadata:
-            metadata_map[i] = ('language', token)
+            categories[i] = 'language'
 
     # Third pass: Season and episode detection with context awareness
     # Third pass: Season and episode detection with context awareness
     i = 0
     while i < n:
-        if i in metadata_map:
+        if categories[i] is not None:
             i += 1
             continue
 
-        token = tokens[i]
-        lower_token = token.lower()
-
-        # Combined season-episode patterns (highest priority)
-        if ('e' in lower_token and lower_token.startswith('s') and
-            any(c.isdigit() for c in token) and len(token) > 3):
-            # Handle S01E02 pattern
-            if lower_token[0] == 's' and 'e' in lower_token:
-                s_part, e_part = lower_token.split('e', 1)
-                if s_part[1:].isdigit() and e_part.isdigit():
-                    metadata_map[i] = ('season_episode', token)
-                    i += 1
-                    continue
-
-        # Season patterns
-        if (lower_token.startswith('s') and len(token) > 1 and
-            (token[1:].isdigit() or ('.' in token[1:] and token[1:].split('.')[0].isdigit()))):
-            metadata_map[i] = ('season', token)
-            i += 1
-            continue
+        lower_token = lowers[i]
 
-        # Episode patterns - enhanced to handle "Ep" pattern
-        if ((lower_token.startswith('e') and len(token) > 1 and
-            (token[1:].isdigit() or ('.' in token[1:] and token[1:].split('.')[0].isdigit()))) or
-            (lower_token.startswith('ep') and len(token) > 2 and
-            (token[2:].isdigit() or ('.' in token[2:] and token[2:].split('.')[0].isdigit())))):
-            metadata_map[i] = ('episode', token)
+        # Combined season-episode (highest priority), season, then episode
+        # patterns including the "Ep" form, in one match
+        match = _RE_SEASON_EPISODE(lower_token)
+        if match:
+            categories[i] = match.lastgroup
             i += 1
             continue
 
         # Season indicators with context
         if lower_token in SEASON_INDICATORS and i+1 < n:
-            metadata_map[i] = ('season_indicator', token)
+            categories[i] = 'season_indicator'
             # Check if next token is a season number
-            next_token = tokens[i+1]
-            if (next_token.isdigit() or
-                (next_token.startswith(('s', 'S')) and any(c.isdigit() for c in next_token)) or
-                ('-' in next_token and any(c.isdigit() for c in next_token))):
-                if i+1 not in metadata_map:
-                    metadata_map[i+1] = ('season_number', next_token)
+            if (is_digit[i+1] or
+                (lowers[i+1].startswith('s') and has_digit[i+1]) or
+                (has_dash[i+1] and has_digit[i+1])):
+                if categories[i+1] is None:
+                    categories[i+1] = 'season_number'
                 i += 2
                 continue
             i += 1
@@ -332,14 +472,13 @@ def categorize_tokens(tokens):
 
         # Episode indicators with context
         if lower_token in EPISODE_INDICATORS and i+1 < n:
-            metadata_map[i] = ('episode_indicator', token)
+            categories[i] = 'episode_indicator'
             # Check if next token is an episode number
-            next_token = tokens[i+1]
-            if (next_token.isdigit() or
-                (next_token.startswith(('e', 'E')) and any(c.isdigit() for c in next_token)) or
-                ('-' in next_token and any(c.isdigit() for c in next_token))):
-                if i+1 not in metadata_map:
-                    metadata_map[i+1] = ('episode_number', next_token)
+            if (is_digit[i+1] or
+                (lowers[i+1].startswith('e') and has_digit[i+1]) or
+                (has_dash[i+1] and has_digit[i+1])):
+                if categories[i+1] is None:
+                    categories[i+1] = 'episode_number'
                 i += 2
                 continue
             i += 1
@@ -350,38 +489,34 @@ def categorize_tokens(tokens):
     # Fourth pass: Backward-looking for episode and season numbers
     # Handle cases like "11 episodes" where the number comes before the indicator
     for i in range(n):
-        if i in metadata_map:
+        if categories[i] is not None:
             continue
 
-        token = tokens[i]
-        lower_token = token.lower()
+        lower_token = lowers[i]
 
         # Check for episode indicators that might have a number before them
         if lower_token in EPISODE_INDICATORS and i > 0:
-            prev_token = tokens[i-1]
             # If previous token is a number and not already categorized as something else
-            if (prev_token.isdigit() and
-                (i-1 not in metadata_map or metadata_map[i-1][0] == 'title')):
-                metadata_map[i-1] = ('episode_number', prev_token)
-                metadata_map[i] = ('episode_indicator', token)
+            if (is_digit[i-1] and
+                (categories[i-1] is None or categories[i-1] == 'title')):
+                categories[i-1] = 'episode_number'
+                categories[i] = 'episode_indicator'
 
         # Check for season indicators that might have a number before them
         if lower_token in SEASON_INDICATORS and i > 0:
-            prev_token = tokens[i-1]
             # If previous token is a number and not already categorized as something else
-            if (prev_token.isdigit() and
-                (i-1 not in metadata_map or metadata_map[i-1][0] == 'title')):
-                metadata_map[i-1] = ('season_number', prev_token)
-                metadata_map[i] = ('season_indicator', token)
+            if (is_digit[i-1] and
+                (categories[i-1] is None or categories[i-1] == 'title')):
+                categories[i-1] = 'season_number'
+                categories[i] = 'season_indicator'
 
     # Fifth pass: Complete indicator detection with context awareness
     # Only mark as complete indicator if it's surrounded by metadata on both sides
     for i in range(n):
-        if i in metadata_map:
+        if categories[i] is not None:
             continue
 
-        token = tokens[i]
-        lower_token = token.lower()
+        lower_token = lowers[i]
 
         if lower_token in COMPLETE_INDICATORS:
             # Check if it's surrounded by metadata
@@ -390,7 +525,7 @@ def categorize_tokens(tokens):
 
             # Check before
             for j in range(i-1, -1, -1):
-                if j in metadata_map:
+                if categories[j] is not None:
                     has_metadata_before = True
                     break
                 if j < title_end:  # Stop if we reach title section
@@ -398,7 +533,7 @@ def categorize_tokens(tokens):
 
             # Check after
             for j in range(i+1, n):
-                if j in metadata_map:
+                if categories[j] is not None:
                     has_metadata_after = True
                     break
                 if j < title_end:  # Stop if we reach title section
@@ -406,59 +541,32 @@ def categorize_tokens(tokens):
 
             # Only mark as complete indicator if it's surrounded by metadata
             if has_metadata_before and has_metadata_after:
-                metadata_map[i] = ('complete_indicator', token)
+                categories[i] = 'complete_indicator'
 
     # Sixth pass: Enhanced validation for episode/season numbers
-    # Ensure numbers following episode/season indicators are properly categorized
+    # Ensure numbers following episode/season indicators are properly categorized.
+    # Numbers tagged here are not indicators, so the windows are fixed up front.
+    near_episode = _near_categories(categories, _EPISODE_CATS)
+    near_season = _near_categories(categories, _SEASON_CATS)
     for i in range(n):
-        if i in metadata_map:
+        if categories[i] is not None:
             continue
 
-        token = tokens[i]
 
         # Check if this is a number that should be part of episode/season
-        if token.isdigit() or ('-' in token and any(c.isdigit() for c in token)):
-            # Look for nearby episode or season indicators
-            has_nearby_indicator = False
-
-            # Check previous tokens
-            for j in range(max(0, i-3), i):
-                if j in metadata_map and metadata_map[j][0] in ('episode_indicator', 'season_indicator', 'episode', 'season'):
-                    has_nearby_indicator = True
-                    break
-
-            # Check next tokens
-            if not has_nearby_indicator:
-                for j in range(i+1, min(n, i+4)):
-                    if j in metadata_map and metadata_map[j][0] in ('episode_indicator', 'season_indicator', 'episode', 'season'):
-                        has_nearby_indicator = True
-                        break
-
-            if has_nearby_indicator:
-                # Determine if it's episode or season number based on context
-                is_episode = False
-                is_season = False
-
-                # Check previous tokens
-                for j in range(max(0, i-3), i):
-                    if j in metadata_map:
-                        if metadata_map[j][0] in ('episode_indicator', 'episode'):
-                            is_episode = True
-                        elif metadata_map[j][0] in ('season_indicator', 'season'):
-                            is_season = True
-
-                # Check next tokens
-                for j in range(i+1, min(n, i+4)):
-                    if j in metadata_map:
-                        if metadata_map[j][0] in ('episode_indicator', 'episode'):
-                            is_episode = True
-                        elif metadata_map[j][0] in ('season_indicator', 'season'):
-                            is_season = True
-
-                if is_episode:
-                    metadata_map[i] = ('episode_number', token)
-                elif is_season:
-                    metadata_map[i] = ('season_number', token)
+        if is_digit[i] or (has_dash[i] and has_digit[i]):
+            # Episode or season indicators up to 3 tokens either side
+            if near_episode[i]:
+                categories[i] = 'episode_number'
+            elif near_season[i]:
+                categories[i] = 'season_number'
+
+    # Find where technical metadata starts; shared by the seventh and eighth passes
+    tech_metadata_start = n
+    for i in range(n):
+        if categories[i] in _TECH_START_CATS:
+            tech_metadata_start = i
+            break
 
     # Seventh pass: Episode name detection with validation
     # Episode name can only exist if we have a title
@@ -467,116 +575,140 @@ def categorize_tokens(tokens):
 
     if title_end < n:
         # Skip year if it's right after title
-        if (title_end in metadata_map and
-            metadata_map[title_end][0] in ('year', 'year_range')):
+        if categories[title_end] in ('year', 'year_range'):
             episode_start = title_end + 1
         else:
             episode_start = title_end
 
         # Find episode end (before technical metadata)
-        for i in range(episode_start, n):
-            if (i in metadata_map and
-                metadata_map[i][0] in ('resolution', 'quality', 'video_codec',
-                                      'audio_codec', 'source', 'file_size')):
-                episode_end = i
-                break
+        if tech_metadata_start >= episode_start:
+            episode_end = tech_metadata_start
         else:
-            episode_end = n
+            for i in range(episode_start, n):
+                if categories[i] in _TECH_START_CATS:
+                    episode_end = i
+                    break
+            else:
+                episode_end = n
 
     # Eighth pass: Group detection (at the end, after technical metadata)
     group_candidates = []
-    tech_metadata_start = n
-
-    # Find where technical metadata starts
-    for i in range(n):
-        if (i in metadata_map and
-            metadata_map[i][0] in ('resolution', 'quality', 'video_codec',
-                                  'audio_codec', 'source', 'file_size')):
-            tech_metadata_start = i
-            break
 
     # Group candidates are at the end, after technical metadata
     for i in range(n-1, tech_metadata_start-1, -1):
-        if i in metadata_map:
-            if metadata_map[i][0] not in ('website', 'file_extension'):
+        if categories[i] is not None:
+            if categories[i] not in ('website', 'file_extension'):
                 break
         else:
-            # Group candidates are typically alphanumeric without being pure numbers
-            if (tokens[i].isalpha() or
-                (any(c.isalpha() for c in tokens[i]) and not tokens[i].isdigit())):
+            # Group candidates are typically alphanumeric without being pure
+            # numbers; a token with any letter in it is never all digits
+            if _has_alpha(tokens[i]):
                 group_candidates.append(i)
             else:
                 break
 
     # Mark groups
     for i in group_candidates:
-        metadata_map[i] = ('group', tokens[i])
+        categories[i] = 'group'
 
     # Ninth pass: Enhanced validation for metadata
     # Check for misclassified tokens and correct them
     for i in range(n):
-        if i in metadata_map:
+        if categories[i] is not None:
             continue
 
         token = tokens[i]
-        lower_token = token.lower()
+        lower_token = lowers[i]
 
         # Check for resolution patterns that might have been missed
-        if (token.endswith('P') and token[:-1].isdigit() and
-            token not in metadata_map.values()):
-            metadata_map[i] = ('resolution', token)
+        if token.endswith('P') and _RE_RESOLUTION(token):
+            categories[i] = 'resolution'
             continue
 
         # Check for video codec patterns that might have been split
         if (i < n-1 and token in {'H', 'x'} and
-            tokens[i+1].isdigit() and tokens[i+1] not in metadata_map):
+            is_digit[i+1]):
             # Handle cases like "H 264" which should be "H.264"
             combined = token + '.' + tokens[i+1]
             if combined.lower() in VIDEO_CODECS:
-                metadata_map[i] = ('video_codec', combined)
-                metadata_map[i+1] = ('ignore', tokens[i+1])  # Mark next token to be ignored
+                categories[i] = 'video_codec'
+                joined_values[i] = combined
+                categories[i+1] = 'ignore'  # Mark next token to be ignored
                 continue
 
     # Tenth pass: Strict title boundary enforcement
     # Once metadata starts, no more title should be tagged
-    final_metadata_map = metadata_map.copy()
     strict_title_end = title_end
 
     # Ensure no title tags beyond the first metadata
     for i in range(title_end, n):
-        if i in final_metadata_map and final_metadata_map[i][0] != 'website':
+        if categories[i] not in (None, 'website'):
             strict_title_end = i
             break
 
     # Eleventh pass: Compile final categorization with validation
     for i in range(n):
-        if i in final_metadata_map:
+        category = categories[i]
+        if category is not None:
             # Skip ignored tokens
-            if final_metadata_map[i][0] == 'ignore':
+            if category == 'ignore':
                 continue
-            categorized.append(final_metadata_map[i])
+            categorized.append((category, joined_values.get(i, tokens[i])))
         elif i < strict_title_end:
             # Title section
             categorized.append(('title', tokens[i]))
         elif i < episode_end:
             # Episode name section with validation
             # Episode name shouldn't be a language, resolution, or pure number
-            if (tokens[i].lower() not in LANGUAGES_FULL and
-                tokens[i].lower() not in LANGUAGES_TWO_LETTER and
-                not tokens[i].isdigit() and
-                not (tokens[i].endswith('GB') or tokens[i].endswith('MB')) and
-                tokens[i].lower() not in RESOLUTIONS):
+            if (lowers[i] not in LANGUAGES_FULL and
+                lowers[i] not in LANGUAGES_TWO_LETTER and
+                not is_digit[i] and
+                not tokens[i].endswith(('GB', 'MB')) and
+                lowers[i] not in RESOLUTIONS):
                 categorized.append(('episode_name', tokens[i]))
             else:
                 categorized.append(('other', tokens[i]))
         else:
             # Remaining tokens that weren't categorized
-            if tokens[i].isdigit():
+            if is_digit[i]:
                 categorized.append(('unknown_digit', tokens[i]))
             else:
                 categorized.append(('other', tokens[i]))
 
-    return categorized
+    return tuple(categorized)
+
+# TLD set for pool workers, installed once per process by _init_worker()
+_WORKER_TLDS = None
+
+def _init_worker(tlds):
+    global _WORKER_TLDS
+    _WORKER_TLDS = tlds
+
+def _categorize_one(filename):
+    tokens = tokenize(filename)
+    return filename, tokens, categorize_tokens(tokens, _WORKER_TLDS)
+
+def categorize_filenames(filenames, tlds=None, workers=1):
+    """Tokenize and categorize a batch of filenames.
+
+    Returns a list of (filename, tokens, categorized) tuples. The TLD set is
+    resolved once for the whole batch. With workers other than 1 the batch
+    is spread over a process pool (None means one worker per CPU).
+    """
+    tlds = get_iana_tlds() if tlds is None else frozenset(tlds)
+    if workers != 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(tlds,)) as executor:
+            return list(executor.map(_categorize_one, filenames, chunksize=64))
+
+    results = []
+    for filename in filenames:
+        tokens = tokenize(filename)
+        results.append((filename, tokens, categorize_tokens(tokens, tlds)))
+    info = _categorize_cached.cache_info()
+    logger.debug("categorize cache: %d hits, %d misses, %d/%d entries",
+                 info.hits, info.misses, info.currsize, info.maxsize)
+    return results
 
 # ========== MODIFIED MAIN FUNCTION ==========
 
@@ -592,10 +724,7 @@ if __name__ == '__main__':
 
     ]
 
-    for filename in test_cases:
-        tokens = tokenize(filename)
-        categorized = categorize_tokens(tokens)
-
+    for filename, tokens, categorized in categorize_filenames(test_cases):
         print(f"Filename: {filename}")
         print(f"Tokens: {tokens}")
         print("Categorized:")
@@ -1,5 +1,3 @@
-import os
-from multiprocessing import cpu_count
 from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,18 +8,29 @@ class Settings(BaseSettings):
     APP_NAME: str = "Torrent Title Parser"
     API_KEY: Optional[str] = None # Set to a secret string to enable auth
     CORS_ORIGINS: List[str] = ["*"] # e.g., ["http://localhost:8000", "http://127.0.0.1:8000"]
+    REGEX_CACHE_SIZE: int = 4096 # Distinct titles whose regex parse is cached
     
     # LLM Settings
     LLM_ENABLED: bool = True
     LLM_MODEL_PATH: str = "/models/unsloth-qwen3-0.6b.gguf"
     N_CTX: int = 4096
-    N_THREADS: int = int(os.environ.get("OMP_NUM_THREADS", cpu_count()))
-    N_BATCH: int = 512
+    N_THREADS: Optional[int] = None # None: OMP_NUM_THREADS if set, else usable physical cores (max 16)
+    LLM_PIN_CORES: bool = False # Bind the process to one logical CPU per physical core (Linux)
+    N_BATCH: int = 2048
+    N_UBATCH: int = 512
     USE_MMAP: bool = True
-    N_GPU_LAYERS: int = 0 # CPU only
+    N_GPU_LAYERS: Optional[int] = None # None: offload all layers (-1) if llama.cpp was built with GPU support, else 0; set 0 to force CPU
+    LLM_CACHE_SIZE: int = 1024 # Distinct (title, remaining text) LLM answers kept; 0 disables
+    LLM_SIMILARITY_THRESHOLD: float = 0.85 # Trigram Jaccard above which a leftover reuses a known title
+    LLM_WORKERS: int = 0 # Under multiple workers, only this many load the model (0: all); the rest parse with regex only
+    LLM_LOCK_DIR: str = "data" # Where workers claim LLM slots via lock files
+    LLM_SKIP_CONFIDENCE: float = 0.5 # Regex results at/above this with a short, clean leftover skip the LLM
 
     # Database Settings
     DATABASE_URL: str = "sqlite+aiosqlite:///data/app.db"
+    SUBMISSION_QUEUE_SIZE: int = 10000 # Pending rows; further submissions are dropped
+    SUBMISSION_FLUSH_ROWS: int = 500 # Max rows per INSERT
+    SUBMISSION_FLUSH_INTERVAL: float = 0.5 # Seconds to gather rows before writing
 
     # Logging Settings
     LOG_FILE_PATH: str = "logs/app.jsonl"
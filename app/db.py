@@ -1,13 +1,19 @@
+import asyncio
 import datetime
-from typing import List
+import hashlib
+import logging
+from typing import Any, Dict, List
 
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, JSON
+from sqlalchemy import create_engine, insert, inspect, select, text, BigInteger, Column, Integer, String, DateTime, JSON, Index
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.config import settings
 from app.schemas import ParsedResult
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = settings.DATABASE_URL
 engine = create_async_engine(DATABASE_URL, echo=False)
 AsyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
@@ -21,35 +27,111 @@ class Submission(Base):
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     client_ip = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
+    # 64-bit hash of raw_title; the unique index drops repeat submissions
+    title_hash = Column(BigInteger, nullable=True)
+
+    # Lets get_recent_submissions read the newest rows without sorting the table
+    __table_args__ = (
+        Index("ix_submissions_created_at", created_at.desc()),
+        Index("ux_submissions_title_hash", title_hash, unique=True),
+    )
+
+def _title_hash(raw_title: str) -> int:
+    digest = hashlib.blake2b(raw_title.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def _insert_submissions():
+    # INSERT that skips rows whose title is already stored (ON CONFLICT DO
+    # NOTHING on SQLite and PostgreSQL; a plain INSERT elsewhere)
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(Submission).on_conflict_do_nothing(index_elements=["title_hash"])
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(Submission).on_conflict_do_nothing(index_elements=["title_hash"])
+    return insert(Submission)
 
 async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all skips existing tables, so add columns introduced later
+        columns = await conn.run_sync(
+            lambda sync_conn: {c["name"] for c in inspect(sync_conn).get_columns(Submission.__tablename__)}
+        )
+        if "title_hash" not in columns:
+            await conn.execute(text("ALTER TABLE submissions ADD COLUMN title_hash BIGINT"))
+        # ...and indexes
+        for index in Submission.__table__.indexes:
+            await conn.run_sync(index.create, checkfirst=True)
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
 
-async def add_submission(
-    db: AsyncSession, 
-    raw_title: str, 
+# --- Queued writes ---
+# Parse endpoints enqueue rows and return; a single worker task drains the
+# queue and writes them with one executemany INSERT and one commit per flush;
+# titles already stored are skipped.
+dropped_submissions = 0
+
+def enqueue_submission(
+    queue: asyncio.Queue,
+    raw_title: str,
     parsed_result: ParsedResult,
     client_ip: str,
     user_agent: str
-):
-    submission = Submission(
-        raw_title=raw_title,
-        parsed_json=parsed_result.model_dump(),
-        client_ip=client_ip,
-        user_agent=user_agent
-    )
-    db.add(submission)
-    await db.commit()
-    await db.refresh(submission)
-    return submission
+) -> bool:
+    """
+    Queue a submission row for the flush worker. When the queue is full the
+    row is dropped and counted rather than slowing down the request.
+    """
+    global dropped_submissions
+    try:
+        queue.put_nowait({
+            "raw_title": raw_title,
+            "title_hash": _title_hash(raw_title),
+            "parsed_json": parsed_result.model_dump(),
+            "client_ip": client_ip,
+            "user_agent": user_agent,
+            "created_at": datetime.datetime.utcnow(),
+        })
+        return True
+    except asyncio.QueueFull:
+        dropped_submissions += 1
+        logger.warning(f"Submission queue full, dropped {dropped_submissions} rows so far")
+        return False
+
+async def _write_submissions(rows: List[Dict[str, Any]]):
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(_insert_submissions(), rows)
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Failed to write {len(rows)} submissions: {e}", exc_info=True)
+
+async def flush_submissions(queue: asyncio.Queue):
+    """
+    Worker loop: wait for a row, give others SUBMISSION_FLUSH_INTERVAL seconds
+    to arrive, then write up to SUBMISSION_FLUSH_ROWS of them at once. On
+    cancellation the rows still queued are written before exiting.
+    """
+    rows = []
+    try:
+        while True:
+            rows.append(await queue.get())
+            await asyncio.sleep(settings.SUBMISSION_FLUSH_INTERVAL)
+            while len(rows) < settings.SUBMISSION_FLUSH_ROWS and not queue.empty():
+                rows.append(queue.get_nowait())
+            await _write_submissions(rows)
+            rows = []
+    except asyncio.CancelledError:
+        while not queue.empty():
+            rows.append(queue.get_nowait())
+        if rows:
+            await _write_submissions(rows)
+        raise
 
-async def get_recent_submissions(db: AsyncSession, limit: int = 50) -> List[Submission]:
+async def get_recent_submissions(db: AsyncSession, limit: int = 50) -> List[Dict[str, Any]]:
+    # Only the column /v1/recent returns; raw_title and client data stay unread
     result = await db.execute(
-        Submission.__table__.select().order_by(Submission.created_at.desc()).limit(limit)
+        select(Submission.parsed_json).order_by(Submission.created_at.desc()).limit(limit)
     )
-    return result.fetchall()
+    return result.scalars().all()
@@ -1,6 +1,11 @@
+import atexit
 import logging
+import queue
 import sys
-import json
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
 from app.config import settings
 
 class JsonFormatter(logging.Formatter):
@@ -16,11 +21,12 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, 'response'):
             log_record['response'] = record.response
             
-        return json.dumps(log_record)
+        # orjson encodes straight to UTF-8 bytes; non-ASCII text is kept as is
+        return orjson.dumps(log_record).decode()
 
 def setup_logging():
     # File handler for JSON logs
-    file_handler = logging.FileHandler(settings.LOG_FILE_PATH)
+    file_handler = logging.FileHandler(settings.LOG_FILE_PATH, encoding="utf-8")
     file_handler.setFormatter(JsonFormatter())
     
     # Console handler for human-readable logs
@@ -30,10 +36,22 @@ def setup_logging():
     )
     console_handler.setFormatter(console_formatter)
 
+    # The real handlers run on a background listener thread, so request
+    # handlers only enqueue records and never block on file or console I/O
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The queue handler only merges args into the message; the real
+    # handlers above apply their own formats
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
     # Configure root logger
     logging.basicConfig(
         level=logging.INFO,
-        handlers=[console_handler, file_handler]
+        handlers=[queue_handler]
     )
 
     # Uvicorn and other library log levels
@@ -1,15 +1,20 @@
+import asyncio
+import fcntl
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from app.config import settings
-from app.db import init_db
+from app.db import flush_submissions, init_db
 from app.logging_conf import setup_logging
 from app.parser_llm import LLMParser
+from app.parser_regex import regex_cache_info
 from app.routes import api_router
 
 # Setup logging
@@ -19,6 +24,26 @@ logger = logging.getLogger(__name__)
 # Application state
 app_state = {}
 
+def _claim_llm_slot() -> bool:
+    """
+    With LLM_WORKERS set, each worker process tries to lock one of that many
+    slot files; only workers holding a slot load the model, so the GGUF is
+    not loaded once per worker. The lock is released when the process exits.
+    """
+    if settings.LLM_WORKERS <= 0:
+        return True
+    os.makedirs(settings.LLM_LOCK_DIR, exist_ok=True)
+    for slot in range(settings.LLM_WORKERS):
+        lock_file = open(os.path.join(settings.LLM_LOCK_DIR, f"llm-worker-{slot}.lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            continue
+        app_state["llm_lock_file"] = lock_file
+        return True
+    return False
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -29,8 +54,18 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized.")
 
+    # Submissions are written in batches by a background worker
+    submission_queue = asyncio.Queue(maxsize=settings.SUBMISSION_QUEUE_SIZE)
+    flush_task = asyncio.create_task(flush_submissions(submission_queue))
+    app_state["submission_queue"] = submission_queue
+
     # Load LLM model
-    if settings.LLM_ENABLED:
+    app_state["llm_worker"] = settings.LLM_ENABLED and _claim_llm_slot()
+    if settings.LLM_ENABLED and not app_state["llm_worker"]:
+        app_state["llm_parser"] = None
+        app_state["model_loaded"] = False
+        logger.info(f"All {settings.LLM_WORKERS} LLM worker slots are taken; this worker parses with regex only.")
+    elif settings.LLM_ENABLED:
         try:
             llm_parser = LLMParser(model_path=settings.LLM_MODEL_PATH)
             app_state["llm_parser"] = llm_parser
@@ -49,6 +84,16 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Application shutdown.")
+    info = regex_cache_info()
+    if lookups := info.hits + info.misses:
+        logger.info(f"Regex cache: {info.hits}/{lookups} hits ({info.hits / lookups:.1%}), {info.currsize} titles cached")
+    if lock_file := app_state.get("llm_lock_file"):
+        lock_file.close()
+    flush_task.cancel()
+    try:
+        await flush_task
+    except asyncio.CancelledError:
+        pass
     app_state.clear()
 
 
@@ -56,6 +101,7 @@ app = FastAPI(
     title="Torrent Title Parser API",
     description="A hybrid Regex + LLM API to parse torrent titles into structured JSON.",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -1,7 +1,11 @@
 import logging
 import os
-from typing import Dict, Any
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional
 
+import llama_cpp
 from llama_cpp import Llama
 
 from app.config import settings
@@ -9,23 +13,32 @@ from app.schemas import ParsedResult
 
 logger = logging.getLogger(__name__)
 
-class LLMParser:
-    def __init__(self, model_path: str):
-        if not os.path.exists(model_path):
-            raise FileNotFoundError(f"Model file not found at {model_path}")
+# GGUF general.file_type values for unquantized weights (F32, F16, BF16).
+# CPU decode is memory-bound, so these run ~2-3x slower than a 4-bit quant.
+UNQUANTIZED_FILE_TYPES = {0: "F32", 1: "F16", 32: "BF16"}
 
-        self.llm = Llama(
-            model_path=model_path,
-            n_ctx=settings.N_CTX,
-            n_threads=settings.N_THREADS,
-            n_batch=settings.N_BATCH,
-            use_mmap=settings.USE_MMAP,
-            n_gpu_layers=settings.N_GPU_LAYERS,
-            verbose=False,
-        )
+STOP_TEXT = "<|eot_id|>"
 
-    def _build_prompt(self, title: str, remaining_text: str) -> str:
-        prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+# Clean names from the prompt examples; LLM answers are added as they come in
+EXAMPLE_TITLES = ["The Boys", "Oppenheimer", "Stranger Things", "The Shawshank Redemption"]
+NON_ALNUM_RE = re.compile(r'[\W_]+')
+
+ROMAN_NUMERAL_RE = re.compile(r'(?=[ivxlcdm]+$)m*(?:cm|cd|d?c{0,3})(?:xc|xl|l?x{0,3})(?:ix|iv|v?i{0,3})$')
+
+def _shingles(text: str) -> FrozenSet[str]:
+    # Character trigrams of the lowercased, separator-normalized text
+    text = f" {NON_ALNUM_RE.sub(' ', text.lower()).strip()} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+def _number_tokens(text: str) -> FrozenSet[str]:
+    # Digit and roman-numeral words; sequels often differ only in these
+    return frozenset(
+        token for token in NON_ALNUM_RE.sub(' ', text.lower()).split()
+        if token.isdigit() or ROMAN_NUMERAL_RE.match(token)
+    )
+
+# Static part of the prompt, identical for every request
+PROMPT_PREFIX = """<|begin_of_text|><|start_header_id|>system<|end_header_id|>
 You are an expert at parsing metadata from file names. Your task is to identify the primary movie or series name from a noisy string. Provide only the cleaned name. Do not explain.
 
 Examples:
@@ -38,15 +51,182 @@ Examples:
 - Input: "The.Shawshank.Redemption.1994.INTERNAL.1080p.BluRay.x264-MARS"
   Output: The Shawshank Redemption<|eot_id|><|start_header_id|>user<|end_header_id|>
 Analyze the following partial torrent title and extract the clean series or movie name.
-Original Title: "{title}"
+"""
+
+def _physical_core_cpus() -> List[int]:
+    """
+    One usable logical CPU per physical core. SMT siblings share a core's
+    vector units, so running a llama.cpp thread on each of them only adds
+    contention. Falls back to every usable CPU when topology is unknown.
+    """
+    try:
+        cpus = sorted(os.sched_getaffinity(0))
+    except AttributeError:  # not available on every platform
+        return list(range(os.cpu_count() or 4))
+    cores = {}
+    try:
+        for cpu in cpus:
+            topology = f"/sys/devices/system/cpu/cpu{cpu}/topology"
+            with open(f"{topology}/physical_package_id") as f:
+                package = f.read().strip()
+            with open(f"{topology}/core_id") as f:
+                core = f.read().strip()
+            cores.setdefault((package, core), cpu)
+    except OSError:
+        return cpus
+    return sorted(cores.values())
+
+def _default_n_threads() -> int:
+    if os.environ.get("OMP_NUM_THREADS"):
+        return int(os.environ["OMP_NUM_THREADS"])
+    # llama.cpp stops scaling well past this on CPU
+    return min(len(_physical_core_cpus()), 16)
+
+def _default_n_gpu_layers() -> int:
+    # -1 offloads every layer; only when this llama.cpp build has a GPU backend
+    try:
+        return -1 if llama_cpp.llama_supports_gpu_offload() else 0
+    except AttributeError:
+        return 0
+
+class LLMParser:
+    def __init__(self, model_path: str):
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Model file not found at {model_path}")
+
+        n_threads = settings.N_THREADS or _default_n_threads()
+        if settings.LLM_PIN_CORES:
+            self._pin_to_physical_cores(n_threads)
+        n_gpu_layers = settings.N_GPU_LAYERS if settings.N_GPU_LAYERS is not None else _default_n_gpu_layers()
+        logger.info(
+            f"LLM threads={n_threads} n_batch={settings.N_BATCH} n_ubatch={settings.N_UBATCH} "
+            f"n_gpu_layers={n_gpu_layers}"
+        )
+        logger.info(f"llama.cpp system info: {llama_cpp.llama_print_system_info().decode(errors='replace').strip()}")
+
+        self.llm = Llama(
+            model_path=model_path,
+            n_ctx=settings.N_CTX,
+            n_threads=n_threads,
+            n_batch=settings.N_BATCH,
+            n_ubatch=settings.N_UBATCH,
+            use_mmap=settings.USE_MMAP,
+            n_gpu_layers=n_gpu_layers,
+            verbose=False,
+        )
+        self._check_quantization(model_path)
+        self._warm_prefix()
+
+        # Generation is deterministic (temperature 0), so answers for a given
+        # (title, remaining text) are reused; least recently used are evicted
+        self._cache = OrderedDict()
+        self._cache_size = settings.LLM_CACHE_SIZE
+        self._cache_lock = threading.Lock()
+        # refine_with_llm runs in the threadpool; the Llama context allows one
+        # generation at a time
+        self._llm_lock = threading.Lock()
+        self._known_titles = {title: (_shingles(title), _number_tokens(title)) for title in EXAMPLE_TITLES}
+
+    def _pin_to_physical_cores(self, n_threads: int):
+        # Set before the model loads so llama.cpp's worker threads inherit it
+        cpus = _physical_core_cpus()[:n_threads]
+        try:
+            os.sched_setaffinity(0, cpus)
+            logger.info(f"Pinned process to CPUs {cpus} (one per physical core)")
+        except (AttributeError, OSError) as e:
+            logger.warning(f"Could not pin to physical cores: {e}")
+
+    def _check_quantization(self, model_path: str):
+        try:
+            file_type = int(self.llm.metadata.get("general.file_type", -1))
+        except (AttributeError, TypeError, ValueError):
+            return
+        if file_type in UNQUANTIZED_FILE_TYPES:
+            logger.warning(
+                f"Model {model_path} has unquantized {UNQUANTIZED_FILE_TYPES[file_type]} weights; "
+                "a 4-bit quant such as Q4_K_M is much faster on CPU."
+            )
+        else:
+            logger.info(f"Loaded model {model_path} (GGUF file type {file_type})")
+
+    def _warm_prefix(self):
+        # Evaluate the static prompt prefix at startup. Every prompt starts
+        # with it and Llama only evaluates the tokens after the longest prefix
+        # it already holds, so even the first request prefills just its suffix.
+        try:
+            tokens = self.llm.tokenize(PROMPT_PREFIX.encode("utf-8"), special=True)
+            self.llm.reset()
+            self.llm.eval(tokens)
+            logger.info(f"Evaluated the {len(tokens)}-token prompt prefix")
+        except Exception as e:
+            logger.warning(f"Could not evaluate prompt prefix: {e}")
+
+    def _build_prompt(self, title: str, remaining_text: str) -> str:
+        prompt = PROMPT_PREFIX + f"""Original Title: "{title}"
 Remaining Text: "{remaining_text}"<|eot_id|><|start_header_id|>assistant<|end_header_id|>"""
         return prompt
 
+    def _match_known_title(self, remaining_text: str) -> Optional[str]:
+        # Closest known clean title by trigram Jaccard similarity, if close
+        # enough. Titles whose numbers differ (Part 1 / Part 2, Episode IV / V)
+        # are never matched, however similar the rest of the text is.
+        shingles = _shingles(remaining_text)
+        if not shingles:
+            return None
+        numbers = _number_tokens(remaining_text)
+        best_title, best_score = None, 0.0
+        with self._cache_lock:
+            known = list(self._known_titles.items())
+        for title, (title_shingles, title_numbers) in known:
+            if title_numbers != numbers:
+                continue
+            score = len(shingles & title_shingles) / len(shingles | title_shingles)
+            if score > best_score:
+                best_title, best_score = title, score
+        return best_title if best_score > settings.LLM_SIMILARITY_THRESHOLD else None
+
+    def _remember_title(self, llm_title: str):
+        with self._cache_lock:
+            self._known_titles[llm_title] = (_shingles(llm_title), _number_tokens(llm_title))
+            if len(self._known_titles) > max(self._cache_size, len(EXAMPLE_TITLES)):
+                self._known_titles.pop(next(iter(self._known_titles)))
+
+    def _generate_title(self, title: str, remaining_text: str) -> str:
+        key = (title, remaining_text)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        prompt = self._build_prompt(title, remaining_text)
+        # Llama reuses the longest already-evaluated token prefix by itself;
+        # temperature 0 makes sampling greedy, and end-of-generation tokens
+        # such as <|eot_id|> stop it
+        with self._llm_lock:
+            output = self.llm(
+                prompt,
+                max_tokens=50,
+                stop=[STOP_TEXT],
+                echo=False,
+                temperature=0.0,
+            )
+        llm_title = output['choices'][0]['text'].strip()
+
+        if self._cache_size > 0:
+            with self._cache_lock:
+                self._cache[key] = llm_title
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        if llm_title:
+            self._remember_title(llm_title)
+        return llm_title
+
     def refine_with_llm(self, parsed_data: Dict[str, Any], remaining_text: str, original_title: str) -> ParsedResult:
         """
         Uses the LLM to fill in gaps, primarily the main title.
         """
-        result = ParsedResult(**parsed_data, raw=original_title)
+        # parse_with_regex already yields correctly typed fields, so skip validation
+        result = ParsedResult.model_construct(**parsed_data, raw=original_title)
         
         # If remaining text is very short or looks good, just use it.
         if len(remaining_text.split()) < 7 and not any(char.isdigit() for char in remaining_text):
@@ -55,18 +235,16 @@ Remaining Text: "{remaining_text}"<|eot_id|><|start_header_id|>assistant<|end_he
             result.notes = "Title derived from simple heuristics."
             return result
 
+        # A leftover that is nearly a title the LLM already produced needs no new call
+        if known_title := self._match_known_title(remaining_text):
+            result.title = known_title
+            result.confidence = min(result.confidence + 0.25, 1.0)
+            result.notes = "Title matched a previously identified title."
+            return result
+
         # Otherwise, use the LLM
-        prompt = self._build_prompt(original_title, remaining_text)
-        
         try:
-            output = self.llm(
-                prompt,
-                max_tokens=50,
-                stop=["<|eot_id|>"],
-                echo=False,
-                temperature=0.0,
-            )
-            llm_title = output['choices'][0]['text'].strip()
+            llm_title = self._generate_title(original_title, remaining_text)
 
             if llm_title:
                 result.title = llm_title
@@ -1,6 +1,8 @@
 import re
-from typing import Dict, Any, List, Tuple
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
+from app.config import settings
 from app.schemas import ParsedResult
 
 # --- Constants and Regex Patterns ---
@@ -20,6 +22,37 @@ EPISODE_RANGE_RE = re.compile(r'\bE(\d{1,3})[-–](\d{1,3})\b', re.I)
 EPISODE_BRACKET_RANGE_RE = re.compile(r'Ep\[(\d{1,3})-(\d{1,3})\]', re.I)
 SIZE_RE = re.compile(r'\b((\d+x)?(\d+(\.\d+)?)\s?(GB|MB|GiB|MiB))\b', re.I)
 LANGUAGES_RE = re.compile(r'\[([^\]]*?(?:Tam|Hin|Eng|Tel|Mal|Kan|Mar|Ben)[^\]]*?)\]', re.I)
+CODEC_TOKEN_RE = re.compile(r'x26[45]|h26[45]', re.I)
+WHITESPACE_RE = re.compile(r'\s+')
+LANGUAGE_SPLIT_RE = re.compile(r'[+\-/,.\s]')
+SEASON_PREFIX_RE = re.compile(r'\b(S\d{2})', re.I)
+DIGIT_RE = re.compile(r'\d')
+# Union of the season/episode patterns scrubbed from the final title. The
+# scrub passes stay sequential (one pass can expose a match for the next),
+# but when none of them matches at all they are skipped together.
+FINAL_SCRUB_RE = re.compile('|'.join(p.pattern for p in (
+    SEASON_RE, EPISODE_RE, EPISODE_RANGE_RE, EPISODE_BRACKET_RANGE_RE, SEASON_PREFIX_RE,
+)), re.I)
+TOKEN_SPLIT_RE = re.compile(r'[\W_]+')
+
+# Lowercased word tokens that can start a match of each closed-set pattern
+# (WEB-DL, H.265, DTS-HD and AC-3 split into several tokens). A title with
+# none of a category's tokens cannot match its regex, so the search is skipped.
+TOKEN_TABLE = {}
+for _category, _tokens in (
+    ('resolution', ('2160p', '1080p', '720p', '480p', '4k')),
+    ('quality', ('webdl', 'web', 'bluray', 'hdtv', 'dvdrip', 'bdrip', 'remux', 'hdrip', 'cam', 'webrip')),
+    ('video_codec', ('x265', 'x264', 'hevc', 'avc', 'h265', 'h264', 'h', 'vp9', 'av1')),
+    ('audio_codec', ('aac', 'eac3', 'ac3', 'ac', 'dts', 'truehd', 'atmos', 'opus', 'mp3')),
+    ('group', ('yts', 'ntb', 'evo', 'fgt', 'amzn', 'nf', 'rarb', 'qxr', 'tigole', 'psa')),
+):
+    for _token in _tokens:
+        TOKEN_TABLE.setdefault(_token, set()).add(_category)
+# Any metadata the regex stage strips; a match in the leftover title means it is still noisy
+METADATA_RE = re.compile('|'.join(p.pattern for p in (
+    YEAR_RE, RESOLUTION_RE, QUALITY_RE, VIDEO_CODEC_RE, AUDIO_CODEC_RE,
+    KNOWN_GROUPS_RE, SEASON_RE, EPISODE_RE, SIZE_RE,
+)), re.I)
 
 LANGUAGE_MAP = {
     'tamil': 'tam', 'tam': 'tam',
@@ -35,7 +68,7 @@ LANGUAGE_MAP = {
 
 def _normalize_token(token: str) -> str:
     # Special cases to prevent incorrect replacements
-    if re.match(r'x26[45]|h26[45]', token, re.I):
+    if CODEC_TOKEN_RE.match(token):
         return token
     return SEPARATORS.sub(' ', token)
 
@@ -45,9 +78,13 @@ def _clean_title(title: str) -> str:
     # Remove brackets
     cleaned_title = BRACKETS.sub(' ', cleaned_title)
     # Collapse multiple spaces
-    return re.sub(r'\s+', ' ', cleaned_title).strip()
+    return WHITESPACE_RE.sub(' ', cleaned_title).strip()
 
 def _parse_episodes(title_part: str) -> Tuple[List[int], Optional[str]]:
+    # Every episode pattern needs a digit; most leftovers have none
+    if not DIGIT_RE.search(title_part):
+        return [], None
+
     episodes = set()
     range_str = None
 
@@ -76,13 +113,14 @@ def _parse_episodes(title_part: str) -> Tuple[List[int], Optional[str]]:
 def _parse_languages(title_part: str) -> List[str]:
     langs = set()
     # Find bracketed language blocks first
-    for match in LANGUAGES_RE.finditer(title_part):
-        lang_block = match.group(1).lower()
-        # Split by common delimiters inside brackets
-        tokens = re.split(r'[+\-/,.\s]', lang_block)
-        for token in tokens:
-            if token in LANGUAGE_MAP:
-                langs.add(LANGUAGE_MAP[token])
+    if '[' in title_part:
+        for match in LANGUAGES_RE.finditer(title_part):
+            lang_block = match.group(1).lower()
+            # Split by common delimiters inside brackets
+            tokens = LANGUAGE_SPLIT_RE.split(lang_block)
+            for token in tokens:
+                if token in LANGUAGE_MAP:
+                    langs.add(LANGUAGE_MAP[token])
 
     # If no bracketed langs found, check for loose tokens
     if not langs:
@@ -91,7 +129,7 @@ def _parse_languages(title_part: str) -> List[str]:
             if token in LANGUAGE_MAP:
                 langs.add(LANGUAGE_MAP[token])
     
-    return sorted(list(langs))
+    return sorted(langs)
 
 def _parse_file_size(size_str: str) -> str:
     match = SIZE_RE.search(size_str)
@@ -113,28 +151,68 @@ def _parse_file_size(size_str: str) -> str:
         return f"{int(total_size)}MB"
     return full_match
 
+def _search_outside(pattern: re.Pattern, text: str, spans: List[Tuple[int, int]]) -> Optional[re.Match]:
+    # First match that doesn't overlap text already claimed by an earlier field
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        if all(end <= a or start >= b for a, b in spans):
+            return match
+    return None
+
+def _remove_spans(text: str, spans: List[Tuple[int, int]]) -> str:
+    # Rebuild text without the given non-overlapping spans in a single join
+    pieces = []
+    pos = 0
+    for start, end in sorted(spans):
+        pieces.append(text[pos:start])
+        pos = end
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+def _token_categories(text: str) -> set:
+    # One pass over the tokens; which closed-set categories could match at all
+    categories = set()
+    for token in TOKEN_SPLIT_RE.split(text.lower()):
+        if token in TOKEN_TABLE:
+            categories |= TOKEN_TABLE[token]
+    return categories
+
 def parse_with_regex(original_title: str) -> Tuple[Dict[str, Any], str]:
-    working_title = original_title
+    # Results are cached per title; the cache holds tuples so callers get a
+    # fresh dict (and fresh lists) they are free to modify
+    items, final_title_str = _parse_with_regex_cached(original_title)
+    result = {key: list(value) if isinstance(value, tuple) else value for key, value in items}
+    return result, final_title_str
+
+def regex_cache_info():
+    return _parse_with_regex_cached.cache_info()
+
+@lru_cache(maxsize=settings.REGEX_CACHE_SIZE)
+def _parse_with_regex_cached(original_title: str) -> Tuple[Tuple[Tuple[str, Any], ...], str]:
+    # Matched metadata is recorded as spans of the original title and cut out
+    # once, rather than re-copying the working title after every match
+    spans = []
     data = {}
     hits = 0
+    present = _token_categories(original_title)
 
     # Process Year
-    if match := YEAR_RE.search(working_title):
+    if match := _search_outside(YEAR_RE, original_title, spans):
         data['year'] = int(match.group(1))
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
 
     # Process Resolution
-    if match := RESOLUTION_RE.search(working_title):
+    if 'resolution' in present and (match := _search_outside(RESOLUTION_RE, original_title, spans)):
         res = match.group(1).lower()
         data['resolution'] = '2160p' if res == '4k' else res
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
 
     # Process Quality
-    if match := QUALITY_RE.search(working_title):
+    if 'quality' in present and (match := _search_outside(QUALITY_RE, original_title, spans)):
         data['quality'] = match.group(1).replace('-', '').upper()
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
         if data['quality'] in ['WEBDL', 'WEBRIP']:
             data['source'] = 'web'
@@ -144,25 +222,27 @@ def parse_with_regex(original_title: str) -> Tuple[Dict[str, Any], str]:
             data['source'] = 'p2p' # assumption
             
     # Process Codecs
-    if match := VIDEO_CODEC_RE.search(working_title):
+    if 'video_codec' in present and (match := _search_outside(VIDEO_CODEC_RE, original_title, spans)):
         codec = match.group(1).upper()
         if '265' in codec: data['video_codec'] = 'x265'
         elif '264' in codec: data['video_codec'] = 'x264'
         else: data['video_codec'] = codec
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
         
-    if match := AUDIO_CODEC_RE.search(working_title):
+    if 'audio_codec' in present and (match := _search_outside(AUDIO_CODEC_RE, original_title, spans)):
         data['audio_codec'] = match.group(1).replace('-', '').upper()
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
 
     # Process Season
-    if match := SEASON_RE.search(working_title):
+    if match := _search_outside(SEASON_RE, original_title, spans):
         data['season'] = int(match.group(2))
-        working_title = working_title.replace(match.group(0), '', 1)
+        spans.append(match.span())
         hits += 1
         
+    working_title = _remove_spans(original_title, spans)
+
     # Process Episodes
     episodes, episode_range = _parse_episodes(working_title)
     if episodes:
@@ -190,27 +270,32 @@ def parse_with_regex(original_title: str) -> Tuple[Dict[str, Any], str]:
     group = None
     if match := GROUP_RE.search(original_title):
         group = next((g for g in match.groups() if g is not None), None)
-    if not group:
+    if not group and 'group' in present:
         if match := KNOWN_GROUPS_RE.search(cleaned_for_group):
             group = match.group(1)
             
+    group_re = None
     if group:
         data['group'] = group
         # Remove group from cleaned title for final title extraction
-        cleaned_for_group = re.sub(r'\b' + re.escape(group) + r'\b', '', cleaned_for_group, flags=re.I)
+        group_re = re.compile(r'\b' + re.escape(group) + r'\b', re.I)
+        cleaned_for_group = group_re.sub('', cleaned_for_group)
         hits += 1
 
     # Final Title cleanup
     # Remove season/episode markers from the title itself
-    final_title_str = re.sub(SEASON_RE, '', cleaned_for_group, flags=re.I)
-    final_title_str = re.sub(EPISODE_RE, '', final_title_str, flags=re.I)
-    final_title_str = re.sub(EPISODE_RANGE_RE, '', final_title_str, flags=re.I)
-    final_title_str = re.sub(EPISODE_BRACKET_RANGE_RE, '', final_title_str, flags=re.I)
-    final_title_str = re.sub(r'\b(S\d{2})', '', final_title_str, flags=re.I) # S01 from S01E02
+    # (the patterns are compiled case-insensitive; re.sub rejects flags for them)
+    final_title_str = cleaned_for_group
+    if FINAL_SCRUB_RE.search(final_title_str):
+        final_title_str = SEASON_RE.sub('', final_title_str)
+        final_title_str = EPISODE_RE.sub('', final_title_str)
+        final_title_str = EPISODE_RANGE_RE.sub('', final_title_str)
+        final_title_str = EPISODE_BRACKET_RANGE_RE.sub('', final_title_str)
+        final_title_str = SEASON_PREFIX_RE.sub('', final_title_str) # S01 from S01E02
     
     # Remove known groups again if they appear at start/middle
-    if data.get('group'):
-        final_title_str = re.sub(r'\b' + re.escape(data['group']) + r'\b', '', final_title_str, flags=re.I)
+    if group_re:
+        final_title_str = group_re.sub('', final_title_str)
 
     # Final cleanup of separators and spacing
     final_title_str = _clean_title(final_title_str).strip()
@@ -219,4 +304,5 @@ def parse_with_regex(original_title: str) -> Tuple[Dict[str, Any], str]:
     confidence = min(hits / 8.0, 0.7)
     
     result = {"confidence": confidence, **data}
-    return result, final_title_str
+    items = tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in result.items())
+    return items, final_title_str
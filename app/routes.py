@@ -1,12 +1,13 @@
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Header, BackgroundTasks, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Header, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
-from app.db import get_db, add_submission, get_recent_submissions
-from app.parser_regex import parse_with_regex
+from app.db import get_db, enqueue_submission, get_recent_submissions
+from app.parser_regex import METADATA_RE, parse_with_regex
 from app.schemas import ParseRequest, ParseBatchRequest, ParsedResult
 
 logger = logging.getLogger(__name__)
@@ -30,7 +31,9 @@ async def health_check():
 @api_router.get("/readyz", status_code=status.HTTP_200_OK, tags=["Health"])
 async def readiness_check(request: Request):
     model_loaded = request.app.state.app_state.get("model_loaded", False)
-    if not model_loaded and settings.LLM_ENABLED:
+    # Regex-only workers (see LLM_WORKERS) are ready without a model
+    llm_worker = request.app.state.app_state.get("llm_worker", True)
+    if not model_loaded and settings.LLM_ENABLED and llm_worker:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Model is not loaded or not ready.",
@@ -38,18 +41,30 @@ async def readiness_check(request: Request):
     return {"status": "ready", "model_loaded": model_loaded}
 
 # --- Core Parsing Logic ---
-async def process_single_title(title: str, llm_parser, db: AsyncSession, request: Request, background_tasks: BackgroundTasks) -> ParsedResult:
-    # Stage 1: Regex parsing
-    regex_results, remaining_text = parse_with_regex(title)
+def _looks_noisy(remaining_text: str) -> bool:
+    return not 1 <= len(remaining_text.split()) <= 4 or METADATA_RE.search(remaining_text) is not None
+
+async def process_single_title(title: str, llm_parser, request: Request, regex_output: Optional[Tuple[Dict[str, Any], str]] = None) -> ParsedResult:
+    # Stage 1: Regex parsing (batch callers run this stage up front)
+    regex_results, remaining_text = regex_output or parse_with_regex(title)
     
-    # Stage 2: LLM refinement (if enabled and loaded)
-    if llm_parser:
-        final_result = llm_parser.refine_with_llm(regex_results, remaining_text, title)
+    # Stage 2: LLM refinement (if enabled and loaded), only for titles the
+    # regex stage could not confidently clean up; it runs in the threadpool
+    # so inference does not block the event loop
+    needs_llm = regex_results['confidence'] < settings.LLM_SKIP_CONFIDENCE or _looks_noisy(remaining_text)
+    if llm_parser and needs_llm:
+        final_result = await run_in_threadpool(llm_parser.refine_with_llm, regex_results, remaining_text, title)
+    elif llm_parser:
+        final_result = ParsedResult.model_construct(**regex_results, raw=title, title=remaining_text.strip())
+        final_result.confidence = min(final_result.confidence + 0.25, 1.0)
+        final_result.notes = "Title derived from regex leftovers; LLM not needed."
     else:
         # Fallback if LLM is disabled or failed to load
-        final_result = ParsedResult(**regex_results, raw=title, title=remaining_text.strip())
+        final_result = ParsedResult.model_construct(**regex_results, raw=title, title=remaining_text.strip())
         if not settings.LLM_ENABLED:
             final_result.notes = "LLM is disabled. Title is based on regex leftovers."
+        elif not request.app.state.app_state.get("llm_worker", True):
+            final_result.notes = "LLM is not loaded in this worker. Title is based on regex leftovers."
         else:
             final_result.notes = "LLM failed to load. Title is based on regex leftovers."
 
@@ -60,42 +75,49 @@ async def process_single_title(title: str, llm_parser, db: AsyncSession, request
     }
     logger.info("Parsing complete", extra=log_data)
     
-    # Persist to DB in the background
-    background_tasks.add_task(
-        add_submission, 
-        db, 
-        raw_title=title, 
-        parsed_result=final_result,
+    return final_result
+
+def _persist(request: Request, title: str, result: ParsedResult):
+    # Handed to the flush worker started in the app lifespan
+    enqueue_submission(
+        request.app.state.app_state["submission_queue"],
+        raw_title=title,
+        parsed_result=result,
         client_ip=request.client.host,
         user_agent=request.headers.get("user-agent")
     )
 
-    return final_result
-
 # --- API Endpoints ---
 @api_router.post("/v1/parse", response_model=ParsedResult, tags=["Parsing"], dependencies=[Depends(get_api_key)])
 async def parse_title(
     payload: ParseRequest,
     request: Request,
-    background_tasks: BackgroundTasks,
     llm_parser = Depends(get_llm_parser),
-    db: AsyncSession = Depends(get_db)
 ):
-    return await process_single_title(payload.title, llm_parser, db, request, background_tasks)
+    result = await process_single_title(payload.title, llm_parser, request)
+    _persist(request, payload.title, result)
+    return result
 
 
 @api_router.post("/v1/parse_batch", response_model=List[ParsedResult], tags=["Parsing"], dependencies=[Depends(get_api_key)])
 async def parse_title_batch(
     payload: ParseBatchRequest,
     request: Request,
-    background_tasks: BackgroundTasks,
     llm_parser = Depends(get_llm_parser),
-    db: AsyncSession = Depends(get_db)
 ):
-    results = []
-    for title in payload.titles:
-        result = await process_single_title(title, llm_parser, db, request, background_tasks)
-        results.append(result)
+    # Each distinct title is parsed (and sent to the LLM) once per batch;
+    # repeats reuse that result. The regex stage runs over the whole batch in
+    # one threadpool call, before any title goes through LLM refinement (which
+    # process_single_title also runs off the event loop).
+    distinct = list(dict.fromkeys(payload.titles))
+    regex_outputs = await run_in_threadpool(lambda: [parse_with_regex(title) for title in distinct])
+    parsed = {}
+    for title, regex_output in zip(distinct, regex_outputs):
+        parsed[title] = await process_single_title(title, llm_parser, request, regex_output=regex_output)
+    results = [parsed[title] for title in payload.titles]
+
+    for title, result in zip(payload.titles, results):
+        _persist(request, title, result)
     return results
 
 @api_router.get("/v1/recent", response_model=List[ParsedResult], tags=["Submissions"])
@@ -106,5 +128,4 @@ async def get_recent(limit: int = 50, db: AsyncSession = Depends(get_db)):
     """
     if limit > 200:
         limit = 200 # Safety cap
-    submissions = await get_recent_submissions(db, limit)
-    return [sub.parsed_json for sub in submissions]
+    return await get_recent_submissions(db, limit)
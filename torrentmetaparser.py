@@ -1,14 +1,92 @@
 import re
 import json
-from typing import Dict, List, Optional, Tuple, Set, Any
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple, Set, Any
 from datetime import datetime
 import logging
+import time
+
+try:
+    import hyperscan
+except ImportError:  # optional: without it patterns are only prefiltered by literal cues
+    hyperscan = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SeasonEpisodeContext(NamedTuple):
+    """Per-title state shared by parse_season and parse_episode"""
+    normalized_title: str
+    # Numbers that are not seasons (years, resolutions) / not episodes (also sizes, codecs)
+    season_excluded: FrozenSet[str]
+    episode_excluded: FrozenSet[str]
+
 class TorrentParser:
+    # Titles whose normalized form / validity is kept (oldest dropped first)
+    CACHE_SIZE = 4096
+    # Seconds the latest plausible release year is reused before it is recomputed
+    MAX_YEAR_TTL = 3600
+    # Compiled hyperscan databases by their (id, expression) entries, shared by
+    # all instances (None when compilation failed)
+    _hyperscan_databases: Dict[Tuple[Tuple[int, bytes], ...], Any] = {}
+    # ASCII characters matched by [^\w\s-], mapped to a space
+    PUNCTUATION_TABLE = {cp: ' ' for cp in range(128)
+                         if not chr(cp).isalnum() and not chr(cp).isspace() and chr(cp) not in '_-'}
+    # Season/episode pattern names that get special handling in parse_season/parse_episode
+    EPISODE_KEYWORD_NAMES = frozenset({
+        "Complete Episodes", "All Episodes", "Full Episode", "All Episode",
+        "Special Episode", "Bonus Episode", "Pilot Episode", "Final Episode",
+        "Premiere Episode", "Season Finale", "Series Finale"})
+    SEASON_KEYWORD_NAMES = frozenset({
+        "Complete Season", "Complete Seasons", "Full Season", "Season Pack",
+        "All Seasons", "All Season"})
+    COMPLEX_SEASON_NAMES = frozenset({"S+S+S list", "Season list", "S list"})
+    SEASON_LIST_NAMES = frozenset({"Season list", "S list"})
+    SEASON_TO_NAMES = frozenset({"Season # to #", "S# to #"})
+    # Common non-language terms that language patterns might match
+    INVALID_LANGUAGE_TERMS = frozenset({
+        'webrip', 'web-dl', 'webdl', 'hdtv', 'bluray', 'blu-ray', 'remux',
+        '5.1', '7.1', '2.0', 'dts', 'atmos', 'ddp', 'aac', 'ac3', 'x264', 'x265',
+        'hevc', 'avc', '1080p', '720p', '2160p', '4k', 'repack', 'proper', 'final',
+        'extended', 'director', 'cut', 'theatrical', 'unrated', 'uncut', 'limited'})
+    # Known release groups (should not be treated as languages)
+    RELEASE_GROUP_NAMES = frozenset({
+        'tgx', 'yts', 'rarbg', 'evo', 'tigole', 'qxr', 'ddr', 'cm', 'tbs', 'ntb',
+        'tla', 'fgt', 'fqm', 'trollhd', 'ctrlhd', 'ebp', 'd-z0n3', 'decibel',
+        'hdchina', 'chd', 'wiki', 'ngb', 'hdwing', 'hds', 'hdarea', 'hdbits',
+        'beyondhd', 'blutonium', 'framestor', 'tayto', 'galaxyrg'})
+    VALID_LANGUAGE_TAGS = frozenset({
+        'vostfr', 'sub', 'esub', 'msubs', 'dual', 'multi', 'dubbed', 'dub',
+        'truefrench', 'vf', 'vff', 'vfi', 'vfq', 'vost', 'vo', 'ov', 'omu',
+        'softsubs', 'hardsubs', 'subtitled'})
+    # Website name parts that are common false positives
+    FALSE_POSITIVE_WEBSITE_PARTS = frozenset({
+        'season', 'episode', 'episodes', 'complete', 'full', 'part',
+        'webrip', 'web-dl', 'hdtv', 'bluray', 'blu-ray', 'remux',
+        '720p', '1080p', '2160p', '4k', 'repack', 'proper', 'final',
+        'extended', 'director', 'cut', 'theatrical', 'unrated', 'uncut',
+        'combined', 'surround', 'stereo', 'dolby'})
+    FILE_EXTENSIONS = ('.mkv', '.mp4', '.avi', '.m4v', '.mpg', '.mpeg', '.srt', '.sub')
+    # How a match of each pattern is reported; patterns missing here are
+    # reported by their name
+    RESOLUTION_FORMATTERS = {
+        "###p": lambda match: f"{match.group(1)}p",
+        "###i": lambda match: f"{match.group(1)}i",
+        "####x###": lambda match: f"{match.group(1)}x{match.group(2)}",
+    }
+    VIDEO_CODEC_FORMATTERS = {
+        name: lambda match, prefix=name[:1]: f"{prefix}{match.group(1)}"
+        for name in ("x###", "H###", "H.###")
+    }
+    AUDIO_CODEC_FORMATTERS = {
+        name: lambda match, prefix=name[:3]: f"{prefix}{match.group(1)}"
+        for name in ("AAC#.#", "DDP#.#", "AC#", "AC#.#", "DD#.#", "EAC#", "MP#")
+    }
+    FILESIZE_FORMATTERS = {
+        name: lambda match, unit=name[-2:]: f"{match.group(1)}{unit}"
+        for name in ("###MB", "###GB", "###.#GB", "###.#MB", "###KB", "###TB", "###.#TB")
+    }
+
     def __init__(self):
         self.season_patterns = self._compile_season_patterns()
         self.episode_patterns = self._compile_episode_patterns()
@@ -24,8 +102,184 @@ class TorrentParser:
         self.encoder_patterns = self._compile_encoder_patterns()
         self.group_patterns = self._compile_group_patterns()
         self.reject_hashed_regexes = self._compile_reject_hashed_regexes()
+        # All reject patterns are anchored at the start, so one match() tries each once
+        self.reject_hashed_regex = re.compile('|'.join(
+            f'(?i:{regex.pattern})' if regex.flags & re.IGNORECASE else f'(?:{regex.pattern})'
+            for regex in self.reject_hashed_regexes), re.ASCII)
+        self.extension_regex = re.compile(r'\.[a-z0-9]{2,4}$', re.IGNORECASE)
         self.pre_substitution_regexes = self._compile_pre_substitution_regexes()
-        
+        self.preserve_regex = self._compile_preserve_regex()
+        self.punctuation_regex = re.compile(r'[^\w\s-]')
+        self.alnum_regex = re.compile(r'[^\W_]')  # same characters as str.isalnum
+        self.whitespace_regex = re.compile(r'\s+')
+        # Numbers parse_season/parse_episode must not read as seasons/episodes
+        self.year_number_regex = re.compile(r'\b(19|20)\d{2}\b')
+        self.resolution_number_regex = re.compile(r'\b(360|480|720|1080|1440|2160|4K)p?\b', re.IGNORECASE)
+        # Numbers inside file sizes and codec names, captured directly; of the
+        # codecs only AV1, VP9, h264 and h265 contain one
+        self.filesize_number_regex = re.compile(r'\b(\d+\.?\d*)[GMK]B\b', re.IGNORECASE)
+        self.codec_number_regex = re.compile(r'\b(?:AV(?=1\b)|VP(?=9\b)|h(?=26[45]\b))(\d+)\b', re.IGNORECASE)
+        self.number_regex = re.compile(r'\d+')
+        self.season_number_regex = re.compile(r's(?:eason)?\s*(\d+)')
+        self.year_range_regex = re.compile(r'\b((19|20)\d{2})-((19|20)\d{2})\b')
+        # parse_year's upper bound and when it is next recomputed (see _latest_year)
+        self._max_year = 0
+        self._max_year_expires = 0.0
+        # Literal cue each season/episode pattern needs (None: no usable cue)
+        self.season_cues = [self._literal_cue(pattern) for _, pattern in self.season_patterns]
+        self.episode_cues = [self._literal_cue(pattern) for _, pattern in self.episode_patterns]
+        # ...and each pattern of the first-match and quality fields
+        self.resolution_cues = [self._literal_cue(pattern) for _, pattern in self.resolution_patterns]
+        self.video_codec_cues = [self._literal_cue(pattern) for _, pattern in self.video_codec_patterns]
+        self.audio_codec_cues = [self._literal_cue(pattern) for _, pattern in self.audio_codec_patterns]
+        self.quality_cues = [self._literal_cue(pattern) for _, pattern in self.quality_patterns]
+        self.language_cues = [self._literal_cue(pattern) for _, pattern in self.language_patterns]
+        # With hyperscan, one scan per title reports which of these patterns can
+        # match; each list's ids start at its entry in hyperscan_first_ids
+        prefiltered = {
+            "season": self.season_patterns,
+            "episode": self.episode_patterns,
+            "resolution": self.resolution_patterns,
+            "video_codec": self.video_codec_patterns,
+            "audio_codec": self.audio_codec_patterns,
+            "language": self.language_patterns,
+            "quality": self.quality_patterns,
+        }
+        self.hyperscan_patterns: List[Tuple[str, re.Pattern]] = []
+        self.hyperscan_first_ids: Dict[str, int] = {}
+        for field, patterns in prefiltered.items():
+            self.hyperscan_first_ids[field] = len(self.hyperscan_patterns)
+            self.hyperscan_patterns += patterns
+        self.hyperscan_unscanned = frozenset(pattern_id for pattern_id, (_, pattern) in enumerate(self.hyperscan_patterns)
+                                             if not pattern.pattern.isascii())
+        self.hyperscan_db = self._compile_hyperscan_db()
+        # Each instance scans with its own scratch space, as the database is shared
+        self.hyperscan_scratch = hyperscan.Scratch(self.hyperscan_db) if self.hyperscan_db is not None else None
+        # All season patterns fused into one regex, to rule out titles none can match
+        self.season_any_regex = self._compile_any_regex(self.season_patterns, self.season_cues)
+        # Every parse_* method normalizes the same title, so results are cached
+        self._norm_cache: Dict[str, str] = {}
+        self._valid_cache: Dict[str, bool] = {}
+        self._season_episode_cache: Dict[str, SeasonEpisodeContext] = {}
+        self._hyperscan_cache: Dict[str, Set[int]] = {}
+        # Fields parse() fills in, in output order
+        self.field_parsers = (
+            ("season", self.parse_season),
+            ("episode", self.parse_episode),
+            ("resolution", self.parse_resolution),
+            ("video_codec", self.parse_video_codec),
+            ("audio_codec", self.parse_audio_codec),
+            ("language", self.parse_language),
+            ("filesize", self.parse_filesize),
+            ("filetype", self.parse_filetype),
+            ("quality", self.parse_quality),
+            ("year", self.parse_year),
+            ("website", self.parse_website),
+            ("encoder", self.parse_encoder),
+            ("group", self.parse_group),
+        )
+
+    def _cache_put(self, cache: Dict[str, Any], key: str, value: Any):
+        if len(cache) >= self.CACHE_SIZE:
+            del cache[next(iter(cache))]
+        cache[key] = value
+
+    @staticmethod
+    def _literal_cue(pattern: re.Pattern) -> Optional[str]:
+        """Lowercase literal that every match of the pattern starts with, if any"""
+        source = pattern.pattern
+        if '|' in source:
+            return None
+        # A leading word boundary is zero-width, the literal follows it
+        if source.startswith(r'\b'):
+            source = source[2:]
+        cue = re.match(r'[a-zA-Z0-9]+', source)
+        if not cue:
+            return None
+        cue = cue.group()
+        # A quantifier after the literal makes its last character optional
+        if source[len(cue):len(cue) + 1] in ('?', '*', '{'):
+            cue = cue[:-1]
+        return cue.lower() or None
+
+    @staticmethod
+    def _compile_any_regex(patterns: List[Tuple[str, re.Pattern]], cues: List[Optional[str]]) -> re.Pattern:
+        """One alternation that matches wherever any of the patterns does"""
+        # Branches are grouped under their first literal character: re tries
+        # every branch at every position, so a flat alternation of dozens of
+        # patterns is slower than running them one by one
+        groups: Dict[str, List[str]] = {}
+        branches = []
+        for (_, pattern), cue in zip(patterns, cues):
+            if cue is None or pattern.pattern[:1].lower() != cue[0]:
+                branches.append(f'(?:{pattern.pattern})')
+            else:
+                groups.setdefault(cue[0], []).append(f'(?:{pattern.pattern[1:]})')
+        branches += [f'{first}(?:{"|".join(rests)})' for first, rests in groups.items()]
+        return re.compile('|'.join(branches), re.IGNORECASE)
+
+    def _compile_hyperscan_db(self):
+        """Compile hyperscan_patterns into a hyperscan prefilter database"""
+        if hyperscan is None:
+            return None
+        # Ids are positions in hyperscan_patterns. Prefilter mode may report
+        # patterns that do not match (and accepts lookarounds hyperscan cannot
+        # run exactly) but never misses one that does. Non-ASCII patterns are
+        # left out and always reported (see _hyperscan_hits).
+        entries = tuple((pattern_id, pattern.pattern.encode('ascii'))
+                        for pattern_id, (_, pattern) in enumerate(self.hyperscan_patterns)
+                        if pattern_id not in self.hyperscan_unscanned)
+        # Compiling takes a good fraction of a second, so it is done once per process
+        if entries in self._hyperscan_databases:
+            return self._hyperscan_databases[entries]
+        flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH
+        db = hyperscan.Database()
+        try:
+            db.compile(
+                expressions=[expression for _, expression in entries],
+                ids=[pattern_id for pattern_id, _ in entries],
+                elements=len(entries),
+                flags=[flags] * len(entries),
+            )
+        except hyperscan.error as e:
+            logger.warning(f"Could not compile hyperscan database, using re only: {e}")
+            db = None
+        self._hyperscan_databases[entries] = db
+        return db
+
+    def _hyperscan_hits(self, normalized_title: str) -> Set[int]:
+        """Ids of the hyperscan_patterns that may match the (ASCII) title"""
+        # Every parse_* method asks for the same title, so one scan serves them all
+        hits = self._hyperscan_cache.get(normalized_title)
+        if hits is None:
+            hits = set(self.hyperscan_unscanned)
+            self.hyperscan_db.scan(
+                normalized_title.encode('ascii'),
+                match_event_handler=lambda pattern_id, start, end, flags, context: hits.add(pattern_id),
+                scratch=self.hyperscan_scratch,
+            )
+            self._cache_put(self._hyperscan_cache, normalized_title, hits)
+        return hits
+
+    def _candidate_patterns(self, patterns, cues, first_id: int, normalized_title: str):
+        """Yield the patterns that may match the title (all of them for non-ASCII titles)"""
+        # Case-insensitive matching also maps some non-ASCII letters (e.g. the
+        # Kelvin sign) onto ASCII ones, so only ASCII titles can be prefiltered.
+        # first_id is the patterns' offset in the hyperscan database
+        if not normalized_title.isascii():
+            yield from patterns
+            return
+        if self.hyperscan_db is not None:
+            hits = self._hyperscan_hits(normalized_title)
+            for pattern_id, entry in enumerate(patterns, first_id):
+                if pattern_id in hits:
+                    yield entry
+            return
+        lowered = normalized_title.lower()
+        for entry, cue in zip(patterns, cues):
+            if cue is None or cue in lowered:
+                yield entry
+
     def _compile_pre_substitution_regexes(self):
         """Compile regex patterns for pre-processing titles (from ParserCommon.cs)"""
         return [
@@ -41,29 +295,55 @@ class TorrentParser:
          "[${subgroup}][${title}][${episode}][")
         ]
     
+    def _compile_preserve_regex(self) -> re.Pattern:
+        """One alternation of the tokens _normalize_title keeps verbatim"""
+        preserved_patterns = [
+            r'\d+\.?\d*[GMK]B',  # File sizes
+            r'\d+\.\d+',         # Audio codecs like 5.1
+            r'WEB[-.]DL', r'HD[-.]Rip', r'BD[-.]Rip', r'DVD[-.]Rip', r'WEB[-.]Rip',
+            r'HDTV', r'BluRay', r'Blu[-.]Ray', r'Telecine', r'TS', r'TC',
+            r'DDP\d+\.?\d*', r'AAC\d*\.?\d*', r'AC\d+\.?\d*', r'DD\d*\.?\d*',
+            r'EAC\d*', r'DTS', r'TrueHD', r'Atmos', r'MP\d+',
+            r'HEVC', r'AVC', r'AV1', r'XviD', r'DivX',
+            r'x\d+', r'H\d+', r'H\.\d+',
+            r'\d+p', r'\d+i', r'\d+x\d+',  # Resolutions
+            r'\[[^]]+\]',                   # Keep bracket content (for groups/tags)
+            r'\(\s*(?:19|20)\d{2}\s*\)',   # Only preserve years in parentheses: (2019)
+            r'S\d+E\d+', r'S\d+', r'Season\s+\d+',  # Season/episode patterns
+            r'\b(?:19|20)\d{2}\b',  # Years (without parentheses)
+            r'\b(?:19|20)\d{2}-(?:19|20)\d{2}\b',  # Year ranges: 1951-1957
+        ]
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in preserved_patterns), re.IGNORECASE)
+
     def _compile_reject_hashed_regexes(self):
         """Compile regex patterns to reject hashed releases (from Parser.cs)"""
+        # Hashes are ASCII: character classes spell out both cases and
+        # IGNORECASE is kept only for the literal words
         return [
-            re.compile(r'^[0-9a-zA-Z]{32}', re.IGNORECASE),
-            re.compile(r'^[a-z0-9]{24}$', re.IGNORECASE),
-            re.compile(r'^[A-Z]{11}\d{3}$', re.IGNORECASE),
-            re.compile(r'^[a-z]{12}\d{3}$', re.IGNORECASE),
-            re.compile(r'^Backup_\d{5,}S\d{2}-\d{2}$', re.IGNORECASE),
-            re.compile(r'^123$', re.IGNORECASE),
-            re.compile(r'^abc$', re.IGNORECASE),
-            re.compile(r'^abc[-_. ]xyz', re.IGNORECASE),
-            re.compile(r'^b00bs$', re.IGNORECASE),
-            re.compile(r'^\d{6}_\d{2}$', re.IGNORECASE),
-            re.compile(r'^[0-9a-zA-Z]{30}', re.IGNORECASE),
-            re.compile(r'^[0-9a-zA-Z]{26}', re.IGNORECASE),
-            re.compile(r'^[0-9a-zA-Z]{39}', re.IGNORECASE),
-            re.compile(r'^[0-9a-zA-Z]{24}', re.IGNORECASE),
+            re.compile(r'^[0-9a-zA-Z]{32}', re.ASCII),
+            re.compile(r'^[a-zA-Z0-9]{24}$', re.ASCII),
+            re.compile(r'^[A-Za-z]{11}\d{3}$', re.ASCII),
+            re.compile(r'^[a-zA-Z]{12}\d{3}$', re.ASCII),
+            re.compile(r'^Backup_\d{5,}S\d{2}-\d{2}$', re.ASCII | re.IGNORECASE),
+            re.compile(r'^123$', re.ASCII),
+            re.compile(r'^abc$', re.ASCII | re.IGNORECASE),
+            re.compile(r'^abc[-_. ]xyz', re.ASCII | re.IGNORECASE),
+            re.compile(r'^b00bs$', re.ASCII | re.IGNORECASE),
+            re.compile(r'^\d{6}_\d{2}$', re.ASCII),
+            re.compile(r'^[0-9a-zA-Z]{30}', re.ASCII),
+            re.compile(r'^[0-9a-zA-Z]{26}', re.ASCII),
+            re.compile(r'^[0-9a-zA-Z]{39}', re.ASCII),
+            re.compile(r'^[0-9a-zA-Z]{24}', re.ASCII),
         ]
     
     def _pre_process_title(self, title: str) -> str:
         """Apply pre-processing substitutions to title"""
+        # Every substitution needs a leading '[' or a -NEXT suffix; skip the
+        # full-title scans for all other titles
+        if not title.startswith('[') and 'next' not in title.lower():
+            return title
         processed_title = title
-        
+
         for regex, replacement in self.pre_substitution_regexes:
             processed_title = regex.sub(replacement, processed_title)
             
@@ -71,25 +351,51 @@ class TorrentParser:
     
     def _is_valid_title(self, title: str) -> bool:
         """Check if title is valid for parsing (not hashed release)"""
-        if 'password' in title.lower() and 'yenc' in title.lower():
+        valid = self._valid_cache.get(title)
+        if valid is None:
+            valid = self._check_valid_title(title)
+            self._cache_put(self._valid_cache, title, valid)
+        return valid
+
+    def _check_valid_title(self, title: str) -> bool:
+        lowered = title.lower()
+        if 'password' in lowered and 'yenc' in lowered:
             return False
             
-        if not any(c.isalnum() for c in title):
+        if not self.alnum_regex.search(title):
             return False
             
         # Remove file extension for checking
-        title_without_ext = re.sub(r'\.[a-z0-9]{2,4}$', '', title, flags=re.IGNORECASE)
+        title_without_ext = self._strip_extension(title)
         
         # Check against reject patterns
-        for reject_regex in self.reject_hashed_regexes:
-            if reject_regex.match(title_without_ext):
-                logger.debug(f"Rejected hashed release title: {title}")
-                return False
+        if self.reject_hashed_regex.match(title_without_ext):
+            logger.debug(f"Rejected hashed release title: {title}")
+            return False
                 
         return True
+
+    def _strip_extension(self, title: str) -> str:
+        """Drop a trailing .xx-.xxxx extension"""
+        # Non-ASCII letters can case-fold into [a-z] and $ also matches before
+        # a final newline, so only leave those cases to the regex
+        if not title.isascii() or title.endswith('\n'):
+            return self.extension_regex.sub('', title)
+        dot = title.rfind('.')
+        extension = title[dot + 1:]
+        if dot >= 0 and 2 <= len(extension) <= 4 and extension.isalnum():
+            return title[:dot]
+        return title
     
     def _normalize_title(self, title: str) -> str:
         """Enhanced normalization based on Sonarr's parsing logic"""
+        normalized_title = self._norm_cache.get(title)
+        if normalized_title is None:
+            normalized_title = self._normalize_title_uncached(title)
+            self._cache_put(self._norm_cache, title, normalized_title)
+        return normalized_title
+
+    def _normalize_title_uncached(self, title: str) -> str:
         if not self._is_valid_title(title):
             return title
 
@@ -99,41 +405,55 @@ class TorrentParser:
         # FIRST: Convert en dash to regular dash for consistency
         normalized_title = normalized_title.replace('–', '-')
 
-        preserved_patterns = [
-            r'\d+\.?\d*[GMK]B',  # File sizes
-            r'\d+\.\d+',         # Audio codecs like 5.1
-            r'WEB[-.]DL', r'HD[-.]Rip', r'BD[-.]Rip', r'DVD[-.]Rip', r'WEB[-.]Rip',
-            r'HDTV', r'BluRay', r'Blu[-.]Ray', r'Telecine', r'TS', r'TC',
-            r'DDP\d+\.?\d*', r'AAC\d*\.?\d*', r'AC\d+\.?\d*', r'DD\d*\.?\d*',
-            r'EAC\d*', r'DTS', r'TrueHD', r'Atmos', r'MP\d+',
-            r'HEVC', r'AVC', r'AV1', r'XviD', r'DivX',
-            r'x\d+', r'H\d+', r'H\.\d+',
-            r'\d+p', r'\d+i', r'\d+x\d+',  # Resolutions
-            r'\[[^]]+\]',                   # Keep bracket content (for groups/tags)
-            r'\(\s*(?:19|20)\d{2}\s*\)',   # Only preserve years in parentheses: (2019)
-            r'S\d+E\d+', r'S\d+', r'Season\s+\d+',  # Season/episode patterns
-            r'\b(?:19|20)\d{2}\b',  # Years (without parentheses)
-            r'\b(?:19|20)\d{2}-(?:19|20)\d{2}\b',  # Year ranges: 1951-1957
-        ]
-
-        placeholder_map = {}
-        for i, pattern in enumerate(preserved_patterns):
-            matches = re.finditer(pattern, normalized_title, re.IGNORECASE)
-            for match in matches:
-                placeholder = f'__PRESERVED_{i}_{len(placeholder_map)}__'
-                normalized_title = normalized_title.replace(match.group(), placeholder)
-                placeholder_map[placeholder] = match.group()
-
-        # Replace other punctuation with spaces (more comprehensive)
-        # Now en dash is already converted to regular dash, so it won't be replaced
-        normalized_title = re.sub(r'[^\w\s-]', ' ', normalized_title)
-        normalized_title = re.sub(r'\s+', ' ', normalized_title).strip()
-
-        # Restore preserved patterns
-        for placeholder, original in placeholder_map.items():
-            normalized_title = normalized_title.replace(placeholder, original)
-
-        return normalized_title
+        # One scan: preserved tokens are kept as is, and only the text between
+        # them has punctuation replaced with spaces and whitespace collapsed
+        # (en dash is already converted to regular dash, so it won't be replaced)
+        parts = []
+        pos = 0
+        for match in self.preserve_regex.finditer(normalized_title):
+            parts.append(self._clean_gap(normalized_title[pos:match.start()]))
+            parts.append(match.group())
+            pos = match.end()
+        parts.append(self._clean_gap(normalized_title[pos:]))
+
+        return ''.join(parts).strip()
+
+    def _season_episode_context(self, title: str) -> SeasonEpisodeContext:
+        """Build (once per title) the state parse_season and parse_episode both need"""
+        context = self._season_episode_cache.get(title)
+        if context is None:
+            context = self._build_season_episode_context(title)
+            self._cache_put(self._season_episode_cache, title, context)
+        return context
+
+    def _build_season_episode_context(self, title: str) -> SeasonEpisodeContext:
+        normalized_title = self._normalize_title(title)
+        season_excluded = set(self.resolution_number_regex.findall(normalized_title))
+        if '19' in normalized_title or '20' in normalized_title:
+            season_excluded.update(self.year_number_regex.findall(normalized_title))
+        season_excluded = frozenset(season_excluded)
+
+        # Numbers from file sizes and codecs are also false positives for episodes.
+        # Each scan only runs when the title has a unit or codec name it needs
+        lowered = normalized_title.lower()
+        episode_numbers = []
+        if 'gb' in lowered or 'mb' in lowered or 'kb' in lowered:
+            episode_numbers += self.filesize_number_regex.findall(normalized_title)
+        if 'av1' in lowered or 'vp9' in lowered or 'h26' in lowered:
+            episode_numbers += self.codec_number_regex.findall(normalized_title)
+        episode_excluded = season_excluded.union(episode_numbers)
+
+        return SeasonEpisodeContext(normalized_title, season_excluded, episode_excluded)
+
+    def _clean_gap(self, text: str) -> str:
+        """Replace punctuation with spaces and collapse whitespace"""
+        if not text.isascii():
+            return self.whitespace_regex.sub(' ', self.punctuation_regex.sub(' ', text))
+        text = text.translate(self.PUNCTUATION_TABLE)
+        # Printable ASCII has no whitespace but the space itself
+        if '  ' in text or not text.isprintable():
+            text = self.whitespace_regex.sub(' ', text)
+        return text
     
     def _compile_season_patterns(self) -> List[Tuple[str, re.Pattern]]:
         """Enhanced season patterns based on Sonarr's parsing"""
@@ -237,7 +557,6 @@ class TorrentParser:
             # Very short episode patterns
             ("E#", re.compile(r'e(\d)\b', re.IGNORECASE)),
             ("E##", re.compile(r'e(\d{2})', re.IGNORECASE)),
-            ("E#-#", re.compile(r'e(\d)-(\d)', re.IGNORECASE)),
             ("E##-##", re.compile(r'e(\d{2})-(\d{2})', re.IGNORECASE)),
             ("E#E#", re.compile(r'e(\d)e(\d)', re.IGNORECASE)),
             ("E##E##", re.compile(r'e(\d{2})e(\d{2})', re.IGNORECASE)),
@@ -245,9 +564,6 @@ class TorrentParser:
 
             # Replace the single-digit patterns with multi-digit versions:
             ("E#-#", re.compile(r'e(\d+)-(\d+)', re.IGNORECASE)),  # Replaces the old single-digit version
-                    # Add negative lookahead to prevent SxEx patterns from being captured as E patterns
-            ("E#-#", re.compile(r'(?<!x)e(\d+)-(\d+)', re.IGNORECASE)),  # Negative lookbehind
-            ("E##-##", re.compile(r'e(\d{2})-(\d{2})', re.IGNORECASE)),  # Keep this for exact 2-digit matches
             
             # Full word episode patterns
             ("Episode #", re.compile(r'episode\s+(\d+)', re.IGNORECASE)),
@@ -294,9 +610,8 @@ class TorrentParser:
             ("Chapters #-#", re.compile(r'chapters\s+(\d+)-(\d+)', re.IGNORECASE)),
             ("Chapters ##-##", re.compile(r'chapters\s+(\d{2})-(\d{2})', re.IGNORECASE)),
             
-            # Anime absolute episode patterns
-            ("Absolute ##", re.compile(r'\b(\d{2,3})\b(?!\s*(?:p|i|gb|mb|kbps|Mbps))', re.IGNORECASE)),
-            ("Absolute ###", re.compile(r'\b(\d{3,4})\b(?!\s*(?:p|i|gb|mb|kbps|Mbps))', re.IGNORECASE)),
+            # Anime absolute episode numbers: bare 2-3 and 3-4 digit numbers, in one scan
+            ("Absolute ##/###", re.compile(r'\b(\d{2,4})\b(?!\s*(?:p|i|gb|mb|kbps|Mbps))', re.IGNORECASE)),
             
             # Daily episode patterns (from Sonarr)
             ("YYYY-MM-DD", re.compile(r'(19|20)\d{2}[-_. ](0[1-9]|1[0-2])[-_. ](0[1-9]|[12][0-9]|3[01])\b', re.IGNORECASE)),
@@ -315,35 +630,20 @@ class TorrentParser:
 
     def parse_episode(self, title: str) -> Optional[str]:
         """Enhanced episode parsing with better exclusion logic"""
-        normalized_title = self._normalize_title(title)
+        context = self._season_episode_context(title)
+        normalized_title = context.normalized_title
         episode_matches = []
-
-        # Extract potential false positives to exclude
-        years = re.findall(r'\b(19|20)\d{2}\b', normalized_title)
-        resolutions = re.findall(r'\b(360|480|720|1080|1440|2160|4K)p?\b', normalized_title, re.IGNORECASE)
-        file_sizes = re.findall(r'\b\d+\.?\d*[GMK]B\b', normalized_title, re.IGNORECASE)
-        video_codecs = re.findall(r'\b(HEVC|AVC|AV1|XviD|DivX|VP9|h264|h265)\b', normalized_title, re.IGNORECASE)
-
-        exclude_numbers = set()
-        exclude_numbers.update(years)
-        exclude_numbers.update(resolutions)
-
-        for size in file_sizes:
-         num_match = re.search(r'(\d+\.?\d*)', size)
-         if num_match:
-            exclude_numbers.add(num_match.group(1))
-
-        for codec in video_codecs:
-         num_match = re.search(r'(\d+)', codec)
-         if num_match:
-            exclude_numbers.add(num_match.group(1))
-
-        for pattern_name, pattern in self.episode_patterns:
+        exclude_numbers = context.episode_excluded
+
+        for pattern_name, pattern in self._candidate_patterns(self.episode_patterns, self.episode_cues, self.hyperscan_first_ids["episode"], normalized_title):
+          if pattern_name == "Absolute ##/###":
+              episode_matches.extend(self._absolute_episodes(pattern, normalized_title, exclude_numbers))
+              continue
+          # Number of capture groups, known from the compiled pattern
+          group_count = pattern.groups
           matches = pattern.finditer(normalized_title)
           for match in matches:
-            if pattern_name in ["Complete Episodes", "All Episodes", "Full Episode", "All Episode",
-                              "Special Episode", "Bonus Episode", "Pilot Episode", "Final Episode",
-                              "Premiere Episode", "Season Finale", "Series Finale"]:
+            if pattern_name in self.EPISODE_KEYWORD_NAMES:
                 episode_matches.append(pattern_name)
             elif pattern_name == "## episodes":  # Handle the new pattern
                 episode_count = match.group(1)
@@ -352,15 +652,15 @@ class TorrentParser:
                     count = int(episode_count)
                     if 1 <= count <= 200:  # Reasonable episode limit
                         episode_matches.append(f"E1-E{count}")
-            elif len(match.groups()) == 1:
+            elif group_count == 1:
                 episode_num = match.group(1)
                 # Check if this number should be excluded
                 if episode_num not in exclude_numbers:
                     # Additional check: episode numbers should be reasonable
                     if episode_num.isdigit() and int(episode_num) <= 200:
                         episode_matches.append(f"E{episode_num.zfill(2)}")
-            elif len(match.groups()) == 2:
-                ep1, ep2 = match.group(1), match.group(2)
+            elif group_count == 2:
+                ep1, ep2 = match.groups()
                 # Check if both numbers should be excluded
                 if ep1 not in exclude_numbers and ep2 not in exclude_numbers:
                     # Additional check: episode numbers should be reasonable
@@ -368,61 +668,62 @@ class TorrentParser:
                         episode_matches.append(f"E{ep1.zfill(2)}-E{ep2.zfill(2)}")
 
             # Add this for 3-group matches (SxEx-# patterns)
-            elif len(match.groups()) == 3:
-                ep1, ep2 = match.group(2), match.group(3)  # Skip season group (group 1)
+            elif group_count == 3:
+                _, ep1, ep2 = match.groups()  # Skip season group (group 1)
                 # Check if both numbers should be excluded
                 if ep1 not in exclude_numbers and ep2 not in exclude_numbers:
                     # Additional check: episode numbers should be reasonable
                     if ep1.isdigit() and ep2.isdigit() and int(ep1) <= 200 and int(ep2) <= 200:
                         episode_matches.append(f"E{ep1.zfill(2)}-E{ep2.zfill(2)}")
 
-            elif pattern_name.startswith("Absolute"):
-                # Handle absolute episode numbers
-                abs_num = match.group(1)
-                if abs_num not in exclude_numbers and abs_num.isdigit() and int(abs_num) <= 2000:
-                    episode_matches.append(f"Abs{abs_num.zfill(3)}")
-
         return ", ".join(episode_matches) if episode_matches else None
 
+    def _absolute_episodes(self, pattern: re.Pattern, normalized_title: str, exclude_numbers: FrozenSet[str]) -> List[str]:
+        """Episodes from bare numbers: the 2-3 digit ones first, then the 3-4 digit ones"""
+        numbers = [number for number in pattern.findall(normalized_title)
+                   if number not in exclude_numbers and number.isdigit() and int(number) <= 200]
+        return ([f"E{number.zfill(2)}" for number in numbers if len(number) <= 3] +
+                [f"E{number.zfill(2)}" for number in numbers if len(number) >= 3])
+
 
     def parse_season(self, title: str) -> Optional[str]:
         """Enhanced season parsing with better exclusion logic"""
-        normalized_title = self._normalize_title(title)
+        context = self._season_episode_context(title)
+        normalized_title = context.normalized_title
+        if not self.season_any_regex.search(normalized_title):
+            return None
         season_matches = []
 
-        # Extract potential years to exclude from season parsing
-        years = re.findall(r'\b(19|20)\d{2}\b', normalized_title)
-        resolutions = re.findall(r'\b(360|480|720|1080|1440|2160|4K)p?\b', normalized_title, re.IGNORECASE)
-
-        exclude_numbers = set(years)
-        exclude_numbers.update(resolutions)
+        # Years and resolutions are excluded from season parsing
+        exclude_numbers = context.season_excluded
 
         # First pass: check for complex patterns like s1s2s3
         complex_pattern_ranges = []
-        for pattern_name, pattern in self.season_patterns:
-            if pattern_name in ["S+S+S list", "Season list", "S list"]:
+        season_patterns = list(self._candidate_patterns(self.season_patterns, self.season_cues, self.hyperscan_first_ids["season"], normalized_title))
+        for pattern_name, pattern in season_patterns:
+            if pattern_name in self.COMPLEX_SEASON_NAMES:
                 matches = pattern.finditer(normalized_title)
                 for match in matches:
                     complex_pattern_ranges.append((match.start(), match.end()))  # Store start and end positions
 
         # Second pass: parse all patterns
-        for pattern_name, pattern in self.season_patterns:
+        for pattern_name, pattern in season_patterns:
+            group_count = pattern.groups
             matches = pattern.finditer(normalized_title)
             for match in matches:
                 # Skip simple patterns if they overlap with complex patterns
                 match_start, match_end = match.start(), match.end()
-                if (pattern_name not in ["S+S+S list", "Season list", "S list"] and
+                if (pattern_name not in self.COMPLEX_SEASON_NAMES and
                     any(start <= match_start < end for start, end in complex_pattern_ranges)):
                     continue
 
-                if pattern_name in ["Complete Season", "Complete Seasons", "Full Season", "Season Pack",
-                                "All Seasons", "All Season"]:
+                if pattern_name in self.SEASON_KEYWORD_NAMES:
                     season_matches.append(pattern_name)
 
-                elif pattern_name in ["Season list", "S list"]:
+                elif pattern_name in self.SEASON_LIST_NAMES:
                     # Extract all numbers from the comma/ampersand separated list
                     season_text = match.group(1)
-                    season_numbers = re.findall(r'\d+', season_text)
+                    season_numbers = self.number_regex.findall(season_text)
                     season_numbers = [int(num) for num in season_numbers if num not in exclude_numbers]
 
                     if season_numbers:
@@ -435,7 +736,7 @@ class TorrentParser:
                     # Handle patterns like s1s2s3, s1-s2-s3, s1_s2_s3, etc.
                     season_text = match.group(1).lower()
                     # Extract all season numbers from the text
-                    season_numbers = re.findall(r's(?:eason)?\s*(\d+)', season_text)
+                    season_numbers = self.season_number_regex.findall(season_text)
                     season_numbers = [int(num) for num in season_numbers if num not in exclude_numbers]
 
                     if season_numbers:
@@ -449,21 +750,21 @@ class TorrentParser:
                                 # If only one season, just add it
                                 season_matches.append(f"S{min_season:02d}")
 
-                elif pattern_name in ["Season # to #", "S# to #"]:
+                elif pattern_name in self.SEASON_TO_NAMES:
                     s1, s2 = int(match.group(1)), int(match.group(2))
                     if str(s1) not in exclude_numbers and str(s2) not in exclude_numbers:
                         if 1 <= s1 <= 50 and 1 <= s2 <= 50:
                             min_season, max_season = min(s1, s2), max(s1, s2)
                             season_matches.append(f"S{min_season:02d}-S{max_season:02d}")
 
-                elif len(match.groups()) == 1:
+                elif group_count == 1:
                     season_num = match.group(1)
                     # Check if this number should be excluded (not a year or resolution)
                     if season_num not in exclude_numbers:
                         season_matches.append(f"S{season_num.zfill(2)}")
 
-                elif len(match.groups()) == 2:
-                    s1, s2 = match.group(1), match.group(2)
+                elif group_count == 2:
+                    s1, s2 = match.groups()
                     # Check if both numbers should be excluded
                     if s1 not in exclude_numbers and s2 not in exclude_numbers:
                         # Additional check: season numbers should be reasonable
@@ -687,101 +988,67 @@ class TorrentParser:
     def parse_resolution(self, title: str) -> Optional[str]:
         """Parse resolution from title"""
         normalized_title = self._normalize_title(title)
-        for pattern_name, pattern in self.resolution_patterns:
+        for pattern_name, pattern in self._candidate_patterns(self.resolution_patterns, self.resolution_cues, self.hyperscan_first_ids["resolution"], normalized_title):
             match = pattern.search(normalized_title)
             if match:
-                if pattern_name == "###p":
-                    return f"{match.group(1)}p"
-                elif pattern_name == "###i":
-                    return f"{match.group(1)}i"
-                elif pattern_name == "####x###":
-                    return f"{match.group(1)}x{match.group(2)}"
-                else:
-                    return pattern_name
+                formatter = self.RESOLUTION_FORMATTERS.get(pattern_name)
+                return formatter(match) if formatter else pattern_name
         return None
 
     def parse_video_codec(self, title: str) -> Optional[str]:
         """Parse video codec from title"""
         normalized_title = self._normalize_title(title)
-        for pattern_name, pattern in self.video_codec_patterns:
+        for pattern_name, pattern in self._candidate_patterns(self.video_codec_patterns, self.video_codec_cues, self.hyperscan_first_ids["video_codec"], normalized_title):
             match = pattern.search(normalized_title)
             if match:
-                if pattern_name in ["x###", "H###", "H.###"]:
-                    return f"{pattern_name[:1]}{match.group(1)}"
-                else:
-                    return pattern_name
+                formatter = self.VIDEO_CODEC_FORMATTERS.get(pattern_name)
+                return formatter(match) if formatter else pattern_name
         return None
 
     def parse_audio_codec(self, title: str) -> Optional[str]:
         """Parse audio codec from title"""
         normalized_title = self._normalize_title(title)
-        for pattern_name, pattern in self.audio_codec_patterns:
+        for pattern_name, pattern in self._candidate_patterns(self.audio_codec_patterns, self.audio_codec_cues, self.hyperscan_first_ids["audio_codec"], normalized_title):
             match = pattern.search(normalized_title)
             if match:
-                if pattern_name in ["AAC#.#", "DDP#.#", "AC#", "AC#.#", "DD#.#", "EAC#", "MP#"]:
-                    return f"{pattern_name[:3]}{match.group(1)}"
-                else:
-                    return pattern_name
+                formatter = self.AUDIO_CODEC_FORMATTERS.get(pattern_name)
+                return formatter(match) if formatter else pattern_name
         return None
 
     def parse_language(self, title: str) -> Optional[str]:
         """Parse language from title using Sonarr's logic"""
         normalized_title = self._normalize_title(title)
-        languages = []
+        # Duplicates are dropped as languages are found
+        languages = set()
 
-        for pattern_name, pattern in self.language_patterns:
+        for pattern_name, pattern in self._candidate_patterns(self.language_patterns, self.language_cues, self.hyperscan_first_ids["language"], normalized_title):
           matches = pattern.finditer(normalized_title)
           for match in matches:
             if pattern_name in ["ISO639-1", "ISO639-2", "LanguageNames", "LanguageVariants"]:
                 # These are valid language patterns
                 language = match.group(0)
                 if self._is_valid_language(language):
-                    languages.append(language)
+                    languages.add(language)
             elif pattern_name == "LanguageTags":
                 # Language tags need additional validation
                 tag = match.group(0)
                 if self._is_valid_language_tag(tag):
-                    languages.append(tag)
+                    languages.add(tag)
 
-        return ", ".join(sorted(set(languages))) if languages else None
+        return ", ".join(sorted(languages)) if languages else None
 
     def _is_valid_language(self, text: str) -> bool:
         """Check if text is a valid language (not a quality term or release group)"""
         text_lower = text.lower()
 
-        # Common non-language terms that might be matched
-        invalid_terms = {
-        'webrip', 'web-dl', 'webdl', 'hdtv', 'bluray', 'blu-ray', 'remux',
-        '5.1', '7.1', '2.0', 'dts', 'atmos', 'ddp', 'aac', 'ac3', 'x264', 'x265',
-        'hevc', 'avc', '1080p', '720p', '2160p', '4k', 'repack', 'proper', 'final',
-        'extended', 'director', 'cut', 'theatrical', 'unrated', 'uncut', 'limited'
-        }
-
-        # Known release groups (should not be treated as languages)
-        release_groups = {
-        'tgx', 'yts', 'rarbg', 'evo', 'tigole', 'qxr', 'ddr', 'cm', 'tbs', 'ntb',
-        'tla', 'fgt', 'fqm', 'trollhd', 'ctrlhd', 'ebp', 'd-z0n3', 'decibel',
-        'hdchina', 'chd', 'wiki', 'ngb', 'hdwing', 'hds', 'hdarea', 'hdbits',
-        'beyondhd', 'blutonium', 'framestor', 'tayto', 'galaxyrg'
-        }
-
-        return (text_lower not in invalid_terms and
-            text_lower not in release_groups and
+        return (text_lower not in self.INVALID_LANGUAGE_TERMS and
+            text_lower not in self.RELEASE_GROUP_NAMES and
             len(text) >= 2 and
             not text.isdigit())
 
     def _is_valid_language_tag(self, tag: str) -> bool:
         """Check if a language tag is valid"""
-        tag_lower = tag.lower()
-
-        # Valid language tags
-        valid_tags = {
-        'vostfr', 'sub', 'esub', 'msubs', 'dual', 'multi', 'dubbed', 'dub',
-        'truefrench', 'vf', 'vff', 'vfi', 'vfq', 'vost', 'vo', 'ov', 'omu',
-        'softsubs', 'hardsubs', 'subtitled'
-        }
-
-        return tag_lower in valid_tags
+        return tag.lower() in self.VALID_LANGUAGE_TAGS
 
     def parse_filesize(self, title: str) -> Optional[str]:
         """Parse file size from title"""
@@ -789,20 +1056,7 @@ class TorrentParser:
         for pattern_name, pattern in self.filesize_patterns:
             match = pattern.search(normalized_title)
             if match:
-                if pattern_name == "###MB":
-                    return f"{match.group(1)}MB"
-                elif pattern_name == "###GB":
-                    return f"{match.group(1)}GB"
-                elif pattern_name == "###.#GB":
-                    return f"{match.group(1)}GB"
-                elif pattern_name == "###.#MB":
-                    return f"{match.group(1)}MB"
-                elif pattern_name == "###KB":
-                    return f"{match.group(1)}KB"
-                elif pattern_name == "###TB":
-                    return f"{match.group(1)}TB"
-                elif pattern_name == "###.#TB":
-                    return f"{match.group(1)}TB"
+                return self.FILESIZE_FORMATTERS[pattern_name](match)
         return None
 
     def parse_filetype(self, title: str) -> Optional[str]:
@@ -818,24 +1072,33 @@ class TorrentParser:
         normalized_title = self._normalize_title(title)
         qualities = []
         
-        for pattern_name, pattern in self.quality_patterns:
+        for pattern_name, pattern in self._candidate_patterns(self.quality_patterns, self.quality_cues, self.hyperscan_first_ids["quality"], normalized_title):
             if pattern.search(normalized_title):
                 qualities.append(pattern_name)
         
         return ", ".join(qualities) if qualities else None
 
+    def _latest_year(self) -> int:
+        """Latest plausible release year (next year), refreshed every MAX_YEAR_TTL seconds"""
+        now = time.monotonic()
+        if now >= self._max_year_expires:
+            self._max_year = datetime.now().year + 1
+            self._max_year_expires = now + self.MAX_YEAR_TTL
+        return self._max_year
+
     def parse_year(self, title: str) -> Optional[str]:
         """Parse year from title"""
         normalized_title = self._normalize_title(title)
 
+        max_year = self._latest_year()
+
         # Check for year ranges first
-        year_range_pattern = re.compile(r'\b((19|20)\d{2})-((19|20)\d{2})\b')
-        year_range_match = year_range_pattern.search(normalized_title)
+        year_range_match = self.year_range_regex.search(normalized_title)
 
         if year_range_match:
             start_year, end_year = year_range_match.group(1), year_range_match.group(3)
-            if (1900 <= int(start_year) <= datetime.now().year + 1 and
-                1900 <= int(end_year) <= datetime.now().year + 1):
+            if (1900 <= int(start_year) <= max_year and
+                1900 <= int(end_year) <= max_year):
                 return f"{start_year}-{end_year}"
 
         # Then check for single years
@@ -846,7 +1109,7 @@ class TorrentParser:
                     return match.group(1)
                 elif pattern_name == "####":
                     year = match.group(1)
-                    if 1900 <= int(year) <= datetime.now().year + 1:
+                    if 1900 <= int(year) <= max_year:
                         return year
                 elif pattern_name == "'##":
                     year = f"20{match.group(1)}" if int(match.group(1)) < 50 else f"19{match.group(1)}"
@@ -883,23 +1146,13 @@ class TorrentParser:
         """Check if a detected website is likely a false positive"""
         website_lower = website.lower()
 
-        # Common false positives
-        false_positives = {
-            'season', 'episode', 'episodes', 'complete', 'full', 'part',
-            'webrip', 'web-dl', 'hdtv', 'bluray', 'blu-ray', 'remux',
-            '720p', '1080p', '2160p', '4k', 'repack', 'proper', 'final',
-            'extended', 'director', 'cut', 'theatrical', 'unrated', 'uncut',
-            'combined', 'surround', 'stereo', 'dolby'  # Added more false positives
-        }
-
         # Check if any part of the website matches false positives
         website_parts = website_lower.split('.')
-        for part in website_parts:
-            if part in false_positives:
-                return True
+        if not self.FALSE_POSITIVE_WEBSITE_PARTS.isdisjoint(website_parts):
+            return True
 
         # Check if website contains common file extensions
-        if any(ext in website_lower for ext in ['.mkv', '.mp4', '.avi', '.m4v', '.mpg', '.mpeg', '.srt', '.sub']):
+        if any(ext in website_lower for ext in self.FILE_EXTENSIONS):
             return True
 
         # Check if website is too short to be a real domain
@@ -950,26 +1203,24 @@ class TorrentParser:
         result = {
             "original_title": title,
             "normalized_title": self._normalize_title(title),
-            "season": self.parse_season(title),
-            "episode": self.parse_episode(title),
-            "resolution": self.parse_resolution(title),
-            "video_codec": self.parse_video_codec(title),
-            "audio_codec": self.parse_audio_codec(title),
-            "language": self.parse_language(title),
-            "filesize": self.parse_filesize(title),
-            "filetype": self.parse_filetype(title),
-            "quality": self.parse_quality(title),
-            "year": self.parse_year(title),
-            "website": self.parse_website(title),
-            "encoder": self.parse_encoder(title),
-            "group": self.parse_group(title),
         }
-        
-        # Clean up None values
-        result = {k: v for k, v in result.items() if v is not None}
-        
+        # Fields are added as they are parsed; None values are left out
+        for field, parse_field in self.field_parsers:
+            value = parse_field(title)
+            if value is not None:
+                result[field] = value
+
         return result
 
+    def parse_batch(self, titles: List[str]) -> List[Dict[str, Any]]:
+        """Parse a list of titles; repeated titles are parsed once"""
+        parsed: Dict[str, Dict[str, Any]] = {}
+        for title in titles:
+            if title not in parsed:
+                parsed[title] = self.parse(title)
+        # Each position gets its own dict, even for repeated titles
+        return [dict(parsed[title]) for title in titles]
+
 
 
 
@@ -1089,10 +1340,9 @@ def main():
 
     # Test with your titles
     results = []
-    for i, title in enumerate(test_titles):
+    for i, (title, result) in enumerate(zip(test_titles, parser.parse_batch(test_titles))):
         #print(f"\n--- Parsing Title {i+1} ---")
         #print(f"Original: {title}")
-        result = parser.parse(title)
         #print(f"Raw result: {result}")
         processed_result = post_process_result(result)
 